@@ -0,0 +1,38 @@
+"""Add media_blobs table
+
+Revision ID: 3f9b2c7d1e04
+Revises: e4f267fe3560
+Create Date: 2026-10-18 09:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9b2c7d1e04'
+down_revision: Union[str, None] = 'e4f267fe3560'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('content_type', sa.String(length=50), nullable=True),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256'),
+    sa.UniqueConstraint('url')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('media_blobs')
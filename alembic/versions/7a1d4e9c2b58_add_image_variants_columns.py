@@ -0,0 +1,35 @@
+"""Add image_variants columns
+
+Revision ID: 7a1d4e9c2b58
+Revises: 3f9b2c7d1e04
+Create Date: 2026-10-18 11:03:27.540916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1d4e9c2b58'
+down_revision: Union[str, None] = '3f9b2c7d1e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MEDIA_TABLES = (
+    'banners', 'gallery', 'news', 'pastevents',
+    'services', 'sub_services', 'teams', 'testimonial',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in MEDIA_TABLES:
+        op.add_column(table, sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in MEDIA_TABLES:
+        op.drop_column(table, 'image_variants')
@@ -0,0 +1,35 @@
+"""Add image_meta columns
+
+Revision ID: b62e0f4d9a13
+Revises: 7a1d4e9c2b58
+Create Date: 2026-10-18 18:02:11.308245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b62e0f4d9a13'
+down_revision: Union[str, None] = '7a1d4e9c2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MEDIA_TABLES = (
+    'banners', 'gallery', 'news', 'pastevents',
+    'services', 'sub_services', 'teams', 'testimonial',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in MEDIA_TABLES:
+        op.add_column(table, sa.Column('image_meta', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in MEDIA_TABLES:
+        op.drop_column(table, 'image_meta')
@@ -0,0 +1,69 @@
+"""Rework indexes: drop free-text indexes, add indexes for list and count queries
+
+Revision ID: d5e8a3c71f20
+Revises: b62e0f4d9a13
+Create Date: 2026-10-18 18:40:52.117406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8a3c71f20'
+down_revision: Union[str, None] = 'b62e0f4d9a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, columns) for B-tree indexes on free text nobody filters on
+TEXT_INDEXES = (
+    ('ix_news_content', 'news', ['content']),
+    ('ix_news_description', 'news', ['description']),
+    ('ix_contact_message', 'contact', ['message']),
+    ('ix_getintouchs_message', 'getintouchs', ['message']),
+    ('ix_banners_description', 'banners', ['description']),
+    ('ix_teams_description', 'teams', ['description']),
+    ('ix_testimonial_description', 'testimonial', ['description']),
+    ('ix_gallery_description', 'gallery', ['description']),
+    ('ix_pastevents_description', 'pastevents', ['description']),
+    ('ix_services_description', 'services', ['description']),
+)
+
+# Composite keys follow the keyset ordering of each list endpoint
+QUERY_INDEXES = (
+    ('ix_bookings_date_time', 'bookings', ['date', 'time', 'id']),
+    ('ix_bookings_status_date_time', 'bookings', ['status', 'date', 'time', 'id']),
+    ('ix_bookings_user_id_date_time', 'bookings', ['user_id', 'date', 'time', 'id']),
+    ('ix_bookings_technician_id', 'bookings', ['technician_id']),
+    ('ix_booking_items_booking_id', 'booking_items', ['booking_id']),
+    ('ix_loyalty_point_transactions_user_id_created_at', 'loyalty_point_transactions', ['user_id', 'created_at', 'id']),
+    ('ix_chat_messages_recipient_timestamp', 'chat_messages', ['recipient', 'timestamp']),
+    ('ix_chat_messages_timestamp', 'chat_messages', ['timestamp', 'id']),
+    ('ix_contact_user_id_created_at', 'contact', ['user_id', 'created_at', 'id']),
+    ('ix_contact_created_at', 'contact', ['created_at', 'id']),
+    ('ix_gallery_created_at', 'gallery', ['created_at', 'id']),
+    ('ix_news_created_at', 'news', ['created_at', 'id']),
+    ('ix_user_role', 'user', ['role', 'id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction; build without locking out writes
+    with op.get_context().autocommit_block():
+        for name, table, columns in QUERY_INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in TEXT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in TEXT_INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in QUERY_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
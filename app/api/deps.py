@@ -1,8 +1,7 @@
 from fastapi import Depends, HTTPException, status
-from app.services.jwt import get_current_user
-from app.db.model.user import User
+from app.services.jwt import Principal, get_current_principal
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(current_user: Principal = Depends(get_current_principal)) -> Principal:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
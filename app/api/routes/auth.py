@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordRequestForm
 
 from sqlalchemy.orm import Session
@@ -6,13 +6,15 @@ from typing import List
 
 from app.schemas.user import UserCreate, UserOut, AdminCreateUser, UserUpdate , TechnicianMinimalOut , UserProfileOut , PasswordResetRequest , PasswordResetConfirm
 from app.crud.user import get_user_by_email, get_user_by_id
+from app.crud.media import release_media
 from app.db.session import get_db
-from app.core.security import get_password_hash, verify_password
+from app.services.passwords import get_password_hash, verify_password
 from app.db.model.user import User
 from app.services.email import send_verification_email , send_reset_password_email  
 from app.utils.token import generate_verification_token, verify_token
-from app.services.jwt import create_access_token
+from app.services.jwt import Principal, create_access_token
 from app.api.deps import get_current_admin_user  # Admin-only route dependenc
+from app.utils.pagination import PageParams, paginate
 
 router = APIRouter()
 
@@ -117,10 +119,13 @@ def create_user_by_admin(user_in: AdminCreateUser, db: Session = Depends(get_db)
 
 @router.get("/technicians", response_model=List[UserOut])
 def get_technicians(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)  # Admin-only route dependency
+    current_user: Principal = Depends(get_current_admin_user)  # Admin-only route dependency
 ):
-    return db.query(User).filter(User.role == "technician").all()
+    query = db.query(User).filter(User.role == "technician")
+    return paginate(query, [User.id], page, response, descending=False)
 
 # ------------------------ Admin Update Technician ------------------------
 
@@ -150,12 +155,13 @@ def update_technician(user_id: int, user_update: UserUpdate, db: Session = Depen
 def delete_technician(
     technician_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     db_technician = get_user_by_id(db, technician_id)
     if not db_technician:
         raise HTTPException(status_code=404, detail="Technician not found")
 
+    release_media(db, db_technician.profile_image)
     db.delete(db_technician)
     db.commit()
     return db_technician
@@ -163,22 +169,26 @@ def delete_technician(
 # ------------------------ Admin to view Users ------------------------
 @router.get("/users", response_model=List[UserOut])
 def get_user(
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)  # Admin-only route dependency
+    current_user: Principal = Depends(get_current_admin_user)  # Admin-only route dependency
 ):
-    return db.query(User).filter(User.role == "user").all()
+    query = db.query(User).filter(User.role == "user")
+    return paginate(query, [User.id], page, response, descending=False)
 
 # ------------------------ Admin Delete users ------------------------
 @router.delete("/delete-users/{user_id}", response_model=UserOut)
 def delete_users(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     db_user = get_user_by_id(db, user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    release_media(db, db_user.profile_image)
     db.delete(db_user)
     db.commit()
     return db_user
@@ -210,7 +220,7 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
 @router.get("/counts/technicians")
 def count_technicians(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     count = db.query(User).filter(User.role == "technician").count()
     return {"count": count}
@@ -218,7 +228,7 @@ def count_technicians(
 @router.get("/counts/users")
 def count_users(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     count = db.query(User).filter(User.role == "user").count()
     return {"count": count}
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import cast, Integer
 from typing import List, Optional
 
 from app.db.session import get_db
+from app.crud import booking as crud_booking
 from app.db.model.booking import Booking, BookingItem
 from app.db.model.user import User
 from app.schemas.booking import (
@@ -13,80 +14,37 @@ from app.schemas.booking import (
     BookingItemResponse,
     BookingUpdate
 )
-from app.db.model.loyalty_point import LoyaltyPointTransaction
+from app.utils.pagination import PageParams, paginate
 
 router = APIRouter()
 
 @router.post("/bookings/", response_model=BookingResponse)
 def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
     try:
-        new_booking = Booking(
-            user_id=booking.user_id,
-            contact_info=booking.contact_info,
-            date=booking.date,
-            time=booking.time,
-            total_amount=booking.total_amount,
-            notes=booking.notes,
-            status="pending"
-        )
-        db.add(new_booking)
-        db.flush()
-
-        for item in booking.items:
-            db_item = BookingItem(
-                booking_id=new_booking.id,
-                sub_service_id=item.sub_service_id,
-                name=item.name,
-                price=item.price,
-                quantity=item.quantity
-            )
-            db.add(db_item)
-
-         # Add this after creating new_booking and before commit
-        user = db.query(User).filter(User.id == booking.user_id).first()
-        if user:
-            # Award standard points
-            earned = 10
-            user.loyalty_points = (user.loyalty_points or 0) + earned
-
-            db.add(LoyaltyPointTransaction(
-                user_id=user.id,
-                points=earned,
-                reason="booking",
-                related_id=new_booking.id
-            ))
-
-            # Handle redemption
-            if booking.points_used and booking.points_used > 0:
-                if user.loyalty_points < booking.points_used:
-                    raise HTTPException(status_code=400, detail="Not enough points")
-                user.loyalty_points -= booking.points_used
-
-                db.add(LoyaltyPointTransaction(
-                    user_id=user.id,
-                    points=-booking.points_used,
-                    reason="redeem",
-                    related_id=new_booking.id
-                ))
-
-            new_booking.points_used = booking.points_used or 0
-
-
+        new_booking = crud_booking.create_booking(db, booking)
+        if not crud_booking.apply_booking_points(db, booking.user_id, new_booking["id"], booking.points_used or 0):
+            raise HTTPException(status_code=400, detail="Not enough points")
         db.commit()
-        db.refresh(new_booking)
         return new_booking
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/bookings/", response_model=List[BookingResponse])
-def get_bookings(status: Optional[str] = None, db: Session = Depends(get_db)):
+def get_bookings(
+    response: Response,
+    status: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
     query = db.query(Booking).options(joinedload(Booking.items))
     if status:
         query = query.filter(Booking.status == 'pending')
-    bookings = query.order_by(Booking.date.desc(), Booking.time.desc()).all()
-    return bookings
+    return paginate(query, [Booking.date, Booking.time, Booking.id], page, response)
 
 
 @router.get("/bookings/{booking_id}", response_model=BookingResponse)
@@ -102,13 +60,16 @@ def get_booking(booking_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/bookings/user/{user_id}", response_model=List[BookingResponse])
-def get_user_bookings(user_id: str, db: Session = Depends(get_db)):
-    bookings = db.query(Booking)\
+def get_user_bookings(
+    user_id: str,
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    query = db.query(Booking)\
         .options(joinedload(Booking.items))\
-        .filter(Booking.user_id == user_id)\
-        .order_by(Booking.date.desc(), Booking.time.desc())\
-        .all()
-    return bookings
+        .filter(Booking.user_id == user_id)
+    return paginate(query, [Booking.date, Booking.time, Booking.id], page, response)
 
 
 @router.get("/booking-users/")
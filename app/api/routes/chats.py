@@ -1,10 +1,13 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Response
 from typing import List, Dict, Optional
 import json
+from datetime import datetime, timezone
 from uuid import uuid4
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, with_async_session
 from app.db.model.chats import ChatMessage
+from app.utils.pagination import PageParams, paginate_async
 
 router = APIRouter()
 
@@ -49,7 +52,8 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 @router.websocket("/ws/{username}")
-async def ws_chat(ws: WebSocket, username: str, db: Session = Depends(get_db)):
+async def ws_chat(ws: WebSocket, username: str):
+    # One short session per stored message, so idle sockets never hold a pool connection
     cid = await manager.connect(ws, username)
     print("CONNECT:", cid, username)
 
@@ -98,11 +102,11 @@ async def ws_chat(ws: WebSocket, username: str, db: Session = Depends(get_db)):
                     sender_id=cid,
                     content=content,
                     recipient=recipient,
-                    is_admin=True
+                    is_admin=True,
+                    timestamp=datetime.now(timezone.utc),
                 )
-                db.add(cm)
-                db.commit()
-                db.refresh(cm)
+                async with with_async_session() as db:
+                    db.add(cm)
 
                 # Send to recipient
                 await manager.send(rid, {
@@ -136,11 +140,11 @@ async def ws_chat(ws: WebSocket, username: str, db: Session = Depends(get_db)):
                     sender_id=cid,
                     content=content,
                     recipient=None,
-                    is_admin=False
+                    is_admin=False,
+                    timestamp=datetime.now(timezone.utc),
                 )
-                db.add(cm)
-                db.commit()
-                db.refresh(cm)
+                async with with_async_session() as db:
+                    db.add(cm)
 
                 # Send confirmation to user
                 await ws.send_json({
@@ -180,8 +184,12 @@ async def ws_chat(ws: WebSocket, username: str, db: Session = Depends(get_db)):
         manager.disconnect(cid)
 
 @router.get("/messages/", response_model=List[dict])
-def list_msgs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    msgs = db.query(ChatMessage).order_by(ChatMessage.timestamp.desc()).offset(skip).limit(limit).all()
+async def list_msgs(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    msgs = await paginate_async(db, select(ChatMessage), [ChatMessage.timestamp, ChatMessage.id], page, response)
     return [
         {
             "id": m.id,
@@ -1,20 +1,23 @@
 
 # app/api/routes/contact.py
-from fastapi import APIRouter, Depends, HTTPException, status , Query
+from fastapi import APIRouter, Depends, HTTPException, status , Query, Response
 from sqlalchemy.orm import Session
 
 from typing import List, Optional
 from app.schemas.contact import ContactForm, ContactResponse , ContactReply
 from app.db.session import get_db
-from app.crud.contact import create_contact , get_user_messages , get_message_by_id , reply_to_message
-from app.services.jwt import get_current_user
-from app.schemas.user import UserOut
-from app.crud.contact import get_all_messages
+from app.crud.contact import create_contact , get_message_by_id , reply_to_message
+from app.services.jwt import Principal, get_current_principal
+from app.crud.contact import query_all_messages, query_user_messages
 from app.services.roles import admin_required
 from app.db.model.contact import ContactModel 
+from app.utils.pagination import PageParams, paginate
 
 router = APIRouter()
 
+# Keyset order for message lists: newest first
+MESSAGE_KEY = [ContactModel.created_at, ContactModel.id]
+
 @router.post("/contact", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
 def submit_contact(contact_form: ContactForm, db: Session = Depends(get_db)):
     try:
@@ -25,24 +28,32 @@ def submit_contact(contact_form: ContactForm, db: Session = Depends(get_db)):
 
 @router.get("/contacts/me", response_model=List[ContactResponse])
 def get_my_messages(
+    response: Response,
     status: Optional[str] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
-    current_user: UserOut = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     try:
-        return get_user_messages(db, current_user.id, status)
+        return paginate(query_user_messages(db, current_user.id, status), MESSAGE_KEY, page, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to fetch messages")
     
 
 @router.get("/contacts/admin", response_model=List[ContactResponse])
 def get_all_user_messages(
+    response: Response,
     status: Optional[str] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
-    current_admin: UserOut = Depends(admin_required)  # Enforce admin access
+    current_admin: Principal = Depends(admin_required)  # Enforce admin access
 ):
     try:
-        return get_all_messages(db, status)
+        return paginate(query_all_messages(db, status), MESSAGE_KEY, page, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to fetch messages")
     
@@ -50,7 +61,7 @@ def get_all_user_messages(
 def get_single_message(
     message_id: int,
     db: Session = Depends(get_db),
-    current_admin: UserOut = Depends(admin_required)
+    current_admin: Principal = Depends(admin_required)
 ):
     contact = get_message_by_id(db, message_id)
     if not contact:
@@ -63,7 +74,7 @@ def reply_to_contact(
     contact_id: int,
     reply_data: ContactReply,
     db: Session = Depends(get_db),
-    current_admin: UserOut = Depends(admin_required)
+    current_admin: Principal = Depends(admin_required)
 ):
     contact = db.query(ContactModel).filter(ContactModel.id == contact_id).first()
 
@@ -1,92 +1,147 @@
 
+import asyncio
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form , Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.services.upload_sessions import replace_media, store_media
+from app.crud.media import release_media
 from app.db.model.gallery import GalleryModel
-import shutil
-import os
-from uuid import uuid4
-from typing import List
+from app.db.bulk import insert_returning
+from app.utils.pagination import PageParams, paginate_async
+from typing import List, Optional
 
 router = APIRouter(prefix="/gallery", tags=["Gallery"])
 
-# Set up the upload directory relative to project root
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_DIR = os.path.normpath(os.path.join(BASE_DIR, "../../../uploads/gallery"))
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+def _gallery_item(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "category": row.category,
+        "image_url": row.image_url,
+        "image_variants": row.image_variants,
+        "image_meta": row.image_meta,
+        "created_at": row.created_at,
+    }
+
+
+def _sources(images: Optional[List[UploadFile]], upload_ids: Optional[List[str]]) -> List[dict]:
+    sources = [{"image": image} for image in images or [] if image.filename]
+    sources += [{"upload_id": upload_id} for upload_id in upload_ids or [] if upload_id]
+    if not sources:
+        raise HTTPException(status_code=400, detail="At least one image file or upload_id is required")
+    return sources
+
+
+def _source_name(source: dict) -> str:
+    return source["image"].filename if "image" in source else source["upload_id"]
 
-def save_image(image: UploadFile) -> str:
-    ext = os.path.splitext(image.filename)[1]
-    filename = f"{uuid4().hex}{ext}"
-    image_path = os.path.join(UPLOAD_DIR, filename)
 
-    with open(image_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
+def _insert_gallery_rows(db: Session, title: str, description: str, category: str, stored: List[dict]):
+    now = datetime.utcnow()
+    return insert_returning(db, GalleryModel, [
+        {
+            "title": title,
+            "description": description or "",
+            "category": category,
+            **media,
+            "created_at": now,
+        }
+        for media in stored
+    ])
 
-    return f"/uploads/gallery/{filename}".replace("\\", "/")
 
 # ------------------ Create Service ------------------
 @router.post("/")
-def create_gallery_items(
+async def create_gallery_items(
     title: str = Form(...),
     description: str = Form(None),
     category: str = Form(...),
-    images: List[UploadFile] = File(...),
-    db: Session = Depends(get_db),
+    images: List[UploadFile] = File(None),
+    upload_ids: List[str] = Form(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
+    sources = _sources(images, upload_ids)
     try:
-        new_items = []
-
-        for image in images:
-            if not image.content_type.startswith("image/"):
-                raise HTTPException(status_code=400, detail=f"{image.filename} is not a valid image")
-
-            image_url = save_image(image)
-
-            gallery_item = GalleryModel(
-                title=title,
-                description=description or "",
-                category=category,
-                image_url=image_url
-            )
-            db.add(gallery_item)
-            db.flush()  # prepares object with id before commit
-
-            new_items.append({
-                "id": gallery_item.id,
-                "title": gallery_item.title,
-                "description": gallery_item.description,
-                "category": gallery_item.category,
-                "image_url": gallery_item.image_url,
-                "created_at": gallery_item.created_at,
-            })
-
-        db.commit()
-        return new_items
+        results = await asyncio.gather(
+            *(store_media(db, **source) for source in sources), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        rows = await db.run_sync(_insert_gallery_rows, title, description, category, results)
+        await db.commit()
+        return [_gallery_item(row) for row in rows]
+
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
 
+# ------------------ Batch Ingest ------------------
+@router.post("/batch")
+async def create_gallery_batch(
+    title: str = Form(...),
+    description: str = Form(None),
+    category: str = Form(...),
+    images: List[UploadFile] = File(None),
+    upload_ids: List[str] = Form(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Ingest many images at once, reporting success or failure per file.
+
+    Files (and completed resumable uploads, by `upload_ids`) are stored
+    concurrently; the ones that were stored are inserted with a single bulk
+    statement, and rejected files don't fail the batch.
+    """
+    sources = _sources(images, upload_ids)
+    results = await asyncio.gather(
+        *(store_media(db, **source) for source in sources), return_exceptions=True
+    )
+
+    stored, positions, errors = [], [], []
+    for index, (source, result) in enumerate(zip(sources, results)):
+        if isinstance(result, BaseException):
+            detail = result.detail if isinstance(result, HTTPException) else "Failed to save image"
+            errors.append({"index": index, "filename": _source_name(source), "detail": detail})
+        else:
+            stored.append(result)
+            positions.append(index)
+
+    try:
+        rows = await db.run_sync(_insert_gallery_rows, title, description, category, stored)
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    
+
+    items = [
+        {"index": index, "filename": _source_name(sources[index]), **_gallery_item(row)}
+        for index, row in zip(positions, rows)
+    ]
+    return {"items": items, "errors": errors}
+
 
     # Add this to your existing FastAPI routes
 @router.get("/getallgallerry")
-def get_gallery_images(db: Session = Depends(get_db)):
+async def get_gallery_images(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
     try:
-        # Order by created_at in descending order (newest first)
-        images = db.query(GalleryModel).order_by(GalleryModel.created_at.desc()).all()
+        # Newest first, one keyset page at a time
+        images = await paginate_async(db, select(GalleryModel), [GalleryModel.created_at, GalleryModel.id], page, response)
         
-        return [
-            {
-                "id": img.id,
-                "title": img.title,
-                "description": img.description,
-                "image_url": img.image_url,
-                "category": img.category,
-                "created_at": img.created_at.isoformat() if img.created_at else None,
-            }
-            for img in images
-        ]
+        return [_gallery_item(img) for img in images]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -96,21 +151,23 @@ def delete_service(gallery_id: int, db: Session = Depends(get_db)):
     service = db.query(GalleryModel).filter(GalleryModel.id == gallery_id).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
+    release_media(db, service.image_url)
     db.delete(service)
     db.commit()
     return Response(status_code=204)  # No content response for DELETE
 
 # ------------------ Update Service ------------------
 @router.put("/{gallery_id}")
-def update_service(
+async def update_service(
     gallery_id: int,
     title: str = Form(...),
     description: str = Form(...),
     category: str = Form(...),
     image: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    upload_id: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    service = db.query(GalleryModel).filter(GalleryModel.id == gallery_id).first()
+    service = await db.scalar(select(GalleryModel).where(GalleryModel.id == gallery_id))
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
@@ -118,15 +175,8 @@ def update_service(
     service.description = description
     service.category = category
 
-    if image:
-        service.image_url = save_image(image)
-    db.commit()
-    db.refresh(service)
-    return {
-        "id": service.id,
-        "title": service.title,
-        "description": service.description,
-        "category": service.category,
-        "image_url": service.image_url,
-    }
+    await replace_media(db, service, image, upload_id)
+    await db.commit()
+    await db.refresh(service)
+    return _gallery_item(service)
 # 
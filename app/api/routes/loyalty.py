@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends , HTTPException
+from fastapi import APIRouter, Depends , HTTPException, Response
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.db.model.loyalty_point import LoyaltyPointTransaction
 from app.schemas.loyalty_point import LoyaltyPointTransactionCreate, LoyaltyPointTransactionOut , LoyaltyAdjustmentRequest
 from typing import List
 from app.db.model.user import User
+from app.utils.pagination import PageParams, paginate
 
 router = APIRouter()
 
@@ -17,11 +18,15 @@ def create_loyalty_transaction(data: LoyaltyPointTransactionCreate, db: Session
     return txn
 
 @router.get("/loyalty-points/user/{user_id}", response_model=List[LoyaltyPointTransactionOut])
-def get_user_loyalty_history(user_id: int, db: Session = Depends(get_db)):
-    return db.query(LoyaltyPointTransaction)\
-        .filter(LoyaltyPointTransaction.user_id == user_id)\
-        .order_by(LoyaltyPointTransaction.created_at.desc())\
-        .all()
+def get_user_loyalty_history(
+    user_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    query = db.query(LoyaltyPointTransaction)\
+        .filter(LoyaltyPointTransaction.user_id == user_id)
+    return paginate(query, [LoyaltyPointTransaction.created_at, LoyaltyPointTransaction.id], page, response)
 
 
 @router.get("/loyalty/user/{user_id}/booking/{booking_id}")
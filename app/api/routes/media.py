@@ -0,0 +1,57 @@
+import os
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from app.api.deps import get_current_admin_user
+from app.services.jwt import Principal
+from app.services.media_gc import sweep_orphans
+from app.services.uploads import UPLOAD_ROOT
+from app.services.image_cache import CACHE_FORMATS, CACHE_WIDTHS, resize_cache, snap_width
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+logger = logging.getLogger(__name__)
+
+RESIZABLE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+# Upload names (uuid or content hash) are never reused, so every response is immutable
+CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+# ------------------ Orphaned Uploads Report ------------------
+@router.get("/orphans")
+async def get_orphaned_uploads(current_user: Principal = Depends(get_current_admin_user)):
+    return await sweep_orphans(dry_run=True)
+
+# ------------------ Reclaim Orphaned Uploads ------------------
+@router.post("/orphans/sweep")
+async def reclaim_orphaned_uploads(current_user: Principal = Depends(get_current_admin_user)):
+    return await sweep_orphans(dry_run=False)
+
+# ------------------ Resized Image ------------------
+@router.get("/{category}/{filename}")
+async def get_resized_image(
+    category: str,
+    filename: str,
+    w: Optional[int] = Query(None, gt=0),
+    fmt: Optional[str] = Query(None),
+):
+    if category.startswith(".") or filename.startswith(".") or ".." in filename:
+        raise HTTPException(status_code=404, detail="Image not found")
+    source = UPLOAD_ROOT / category / filename
+    if os.path.splitext(filename)[1].lower() not in RESIZABLE_EXTENSIONS or not source.is_file():
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    if fmt is not None and fmt.lower() == "jpg":
+        fmt = "jpeg"
+    if fmt is not None and fmt.lower() not in CACHE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Allowed: {', '.join(CACHE_FORMATS)}")
+    if w is None and fmt is None:
+        return FileResponse(source, headers=CACHE_HEADERS)
+
+    fmt = (fmt or "webp").lower()
+    try:
+        cached = await resize_cache.get(source, snap_width(w or CACHE_WIDTHS[-1]), fmt)
+    except Exception as e:
+        logger.error(f"Error resizing {category}/{filename}: {e}")
+        raise HTTPException(status_code=422, detail="Image could not be resized")
+    return FileResponse(cached, media_type=CACHE_FORMATS[fmt], headers=CACHE_HEADERS)
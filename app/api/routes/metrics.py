@@ -0,0 +1,34 @@
+import os
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_admin_user
+from app.services.jwt import Principal
+from app.db.pool import pool_metrics
+from app.services.response_cache import response_cache
+from app.services.identity_cache import identity_cache
+from app.services.passwords import password_pool_metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+# ------------------ Connection Pool Gauges ------------------
+# Per worker process: each response reports the pid that served it
+@router.get("/db-pool")
+def get_db_pool_metrics(current_user: Principal = Depends(get_current_admin_user)):
+    return pool_metrics()
+
+
+# ------------------ Response Cache ------------------
+@router.get("/response-cache")
+def get_response_cache_metrics(current_user: Principal = Depends(get_current_admin_user)):
+    return {"pid": os.getpid(), **response_cache.stats()}
+
+
+# ------------------ Identity Cache ------------------
+@router.get("/identity-cache")
+def get_identity_cache_metrics(current_user: Principal = Depends(get_current_admin_user)):
+    return {"pid": os.getpid(), **identity_cache.stats()}
+
+
+# ------------------ Password Hashing Pool ------------------
+@router.get("/password-pool")
+def get_password_pool_metrics(current_user: Principal = Depends(get_current_admin_user)):
+    return {"pid": os.getpid(), **password_pool_metrics()}
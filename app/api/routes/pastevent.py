@@ -1,73 +1,57 @@
 
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.services.upload_sessions import replace_media, store_media
+from app.crud.media import release_media
 from app.db.model.pastevent import PastEventModel
-import shutil
-import os
-from uuid import uuid4
 from typing import List
 
 router = APIRouter(prefix="/pastevents", tags=["Pastevents"])
 
-# Set up the upload directory relative to project root
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_DIR = os.path.normpath(os.path.join(BASE_DIR, "../../../uploads/pastevents"))
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-def save_image(image: UploadFile) -> str:
-    ext = os.path.splitext(image.filename)[1]
-    filename = f"{uuid4().hex}{ext}"
-    image_path = os.path.join(UPLOAD_DIR, filename)
-
-    with open(image_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
-
-    return f"/uploads/pastevents/{filename}".replace("\\", "/")
+def _past_event_item(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "image_url": row.image_url,
+        "image_variants": row.image_variants,
+        "image_meta": row.image_meta,
+    }
 
 # ------------------ Create Service ------------------
 @router.post("/")
-def create_service(
+async def create_service(
     name: str = Form(...),
     description: str = Form(...),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    image_url = save_image(image)
+    media = await store_media(db, image)
 
     new_service = PastEventModel(
         name=name,
         description=description,
-        image_url=image_url
+        **media
     )
     db.add(new_service)
-    db.commit()
-    db.refresh(new_service)
+    await db.commit()
+    await db.refresh(new_service)
 
-    return {
-        "id": new_service.id,
-        "name": new_service.name,
-        "description": new_service.description,
-        "image_url": new_service.image_url,
-    }
+    return _past_event_item(new_service)
 
 # ------------------ Get All Services ------------------
 @router.get("/")
-def get_all_services(page: int = 1, limit: int = 5, db: Session = Depends(get_db)):
+async def get_all_services(page: int = 1, limit: int = 5, db: AsyncSession = Depends(get_async_db)):
     skip = (page - 1) * limit
-    services = db.query(PastEventModel).offset(skip).limit(limit).all()
-    total_count = db.query(PastEventModel).count()
+    services = (await db.scalars(select(PastEventModel).offset(skip).limit(limit))).all()
+    total_count = await db.scalar(select(func.count()).select_from(PastEventModel))
 
     return {
-        "items": [
-            {
-                "id": s.id,
-                "name": s.name,
-                "description": s.description,
-                "image_url": s.image_url,
-            } for s in services
-        ],
+        "items": [_past_event_item(s) for s in services],
         "totalCount": total_count
     }
 
@@ -77,41 +61,30 @@ def get_service_by_id(service_id: int, db: Session = Depends(get_db)):
     service = db.query(PastEventModel).filter(PastEventModel.id == service_id).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
-    return {
-        "id": service.id,
-        "name": service.name,
-        "description": service.description,
-        "image_url": service.image_url,
-    }
+    return _past_event_item(service)
 
 # ------------------ Update Service ------------------
 @router.put("/{service_id}")
-def update_service(
+async def update_service(
     service_id: int,
     name: str = Form(...),
     description: str = Form(...),
     image: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    service = db.query(PastEventModel).filter(PastEventModel.id == service_id).first()
+    service = await db.scalar(select(PastEventModel).where(PastEventModel.id == service_id))
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
     service.name = name
     service.description = description
 
-    if image:
-        service.image_url = save_image(image)
+    await replace_media(db, service, image)
 
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    await db.refresh(service)
 
-    return {
-        "id": service.id,
-        "name": service.name,
-        "description": service.description,
-        "image_url": service.image_url,
-    }
+    return _past_event_item(service)
 
 # ------------------ Delete Service ------------------
 @router.delete("/{service_id}")
@@ -120,6 +93,7 @@ def delete_service(service_id: int, db: Session = Depends(get_db)):
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
+    release_media(db, service.image_url)
     db.delete(service)
     db.commit()
 
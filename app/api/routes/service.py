@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.services.upload_sessions import replace_media, store_media
+from app.crud.media import release_media
 from app.db.model.service import ServiceModel
-import shutil
-import os
-from uuid import uuid4
 from typing import List
 from slugify import slugify
 from app.schemas.service import ServiceOut
@@ -12,66 +13,48 @@ from fastapi import Path
 
 router = APIRouter(prefix="/services", tags=["Services"])
 
-# Set up the upload directory relative to project root
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_DIR = os.path.normpath(os.path.join(BASE_DIR, "../../../uploads/services"))
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-def save_image(image: UploadFile) -> str:
-    ext = os.path.splitext(image.filename)[1]
-    filename = f"{uuid4().hex}{ext}"
-    image_path = os.path.join(UPLOAD_DIR, filename)
-
-    with open(image_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
-
-    return f"/uploads/services/{filename}".replace("\\", "/")
+def _service_item(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "slug": row.slug,
+        "description": row.description,
+        "image_url": row.image_url,
+        "image_variants": row.image_variants,
+        "image_meta": row.image_meta,
+    }
 
 # ------------------ Create Service ------------------
 @router.post("/")
-def create_service(
+async def create_service(
     name: str = Form(...),
     description: str = Form(...),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    image_url = save_image(image)
+    media = await store_media(db, image)
     slug = slugify(name)  # <- create slug from service name
     new_service = ServiceModel(
         name=name,
         slug=slug,
         description=description,
-        image_url=image_url
+        **media
     )
     db.add(new_service)
-    db.commit()
-    db.refresh(new_service)
+    await db.commit()
+    await db.refresh(new_service)
 
-    return {
-        "id": new_service.id,
-        "name": new_service.name,
-        "slug": new_service.slug,  # include slug
-        "description": new_service.description,
-        "image_url": new_service.image_url,
-    }
+    return _service_item(new_service)
 
 # ------------------ Get All Services ------------------
 @router.get("/")
-def get_all_services(page: int = 1, limit: int = 5, db: Session = Depends(get_db)):
+async def get_all_services(page: int = 1, limit: int = 5, db: AsyncSession = Depends(get_async_db)):
     skip = (page - 1) * limit
-    services = db.query(ServiceModel).offset(skip).limit(limit).all()
-    total_count = db.query(ServiceModel).count()
+    services = (await db.scalars(select(ServiceModel).offset(skip).limit(limit))).all()
+    total_count = await db.scalar(select(func.count()).select_from(ServiceModel))
 
     return {
-        "items": [
-            {
-                "id": s.id,
-                "name": s.name,
-                "slug": s.slug,
-                "description": s.description,
-                "image_url": s.image_url,
-            } for s in services
-        ],
+        "items": [_service_item(s) for s in services],
         "totalCount": total_count
     }
 
@@ -81,41 +64,30 @@ def get_service_by_id(service_id: int, db: Session = Depends(get_db)):
     service = db.query(ServiceModel).filter(ServiceModel.id == service_id).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
-    return {
-        "id": service.id,
-        "name": service.name,
-        "description": service.description,
-        "image_url": service.image_url,
-    }
+    return _service_item(service)
 
 # ------------------ Update Service ------------------
 @router.put("/{service_id}")
-def update_service(
+async def update_service(
     service_id: int,
     name: str = Form(...),
     description: str = Form(...),
     image: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    service = db.query(ServiceModel).filter(ServiceModel.id == service_id).first()
+    service = await db.scalar(select(ServiceModel).where(ServiceModel.id == service_id))
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
     service.name = name
     service.description = description
 
-    if image:
-        service.image_url = save_image(image)
+    await replace_media(db, service, image)
 
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    await db.refresh(service)
 
-    return {
-        "id": service.id,
-        "name": service.name,
-        "description": service.description,
-        "image_url": service.image_url,
-    }
+    return _service_item(service)
 
 # ------------------ Delete Service ------------------
 @router.delete("/{service_id}")
@@ -124,6 +96,9 @@ def delete_service(service_id: int, db: Session = Depends(get_db)):
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
+    release_media(db, service.image_url)
+    for sub_service in service.sub_services:  # removed by the delete-orphan cascade
+        release_media(db, sub_service.image_url)
     db.delete(service)
     db.commit()
 
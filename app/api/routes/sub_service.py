@@ -1,98 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import joinedload
 from typing import List   # <-- Add this line
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
+from app.services.upload_sessions import replace_media, store_media
+from app.crud.media import release_media
 from app.db.model.sub_service import SubService
 from app.db.model.service import ServiceModel
 from app.schemas import sub_service as schemas
 from app.crud import crud_sub_services
-import shutil
-import os
-from uuid import uuid4
+from app.utils.pagination import PageParams, paginate_async
 
 router = APIRouter(prefix="/sub-services", tags=["Sub Services"])
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_DIR = os.path.normpath(os.path.join(BASE_DIR, "../../../uploads/sub_services"))
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-def save_image(image: UploadFile) -> str:
-    ext = os.path.splitext(image.filename)[1]
-    filename = f"{uuid4().hex}{ext}"
-    image_path = os.path.join(UPLOAD_DIR, filename)
-
-    with open(image_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
-
-    return f"/uploads/sub_services/{filename}".replace("\\", "/")
+def _sub_service_item(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "price": row.price,
+        "image_url": row.image_url,
+        "image_variants": row.image_variants,
+        "image_meta": row.image_meta,
+        "service_id": row.service_id,
+    }
 
 # CREATE
 @router.post("/")
-def create_sub_service(
+async def create_sub_service(
     name: str = Form(...),
     description: str = Form(...),
     price: float = Form(...),
     image: UploadFile = File(...),
     service_id: int = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    service = db.query(ServiceModel).filter(ServiceModel.id == service_id).first()
+    service = await db.scalar(select(ServiceModel).where(ServiceModel.id == service_id))
     if not service:
         raise HTTPException(status_code=404, detail="Parent service not found")
 
-    image_url = save_image(image)
+    media = await store_media(db, image)
 
     sub_service = SubService(
         name=name,
         description=description,
         price=price,
-        image_url=image_url,
+        **media,
         service_id=service_id
     )
     db.add(sub_service)
-    db.commit()
-    db.refresh(sub_service)
+    await db.commit()
+    await db.refresh(sub_service)
 
-    return {
-        "id": sub_service.id,
-        "name": sub_service.name,
-        "description": sub_service.description,
-        "price": sub_service.price,
-        "image_url": sub_service.image_url,
-        "service_id": sub_service.service_id
-    }
+    return _sub_service_item(sub_service)
 
 # FETCH ALL
 @router.get("/manage/")
-def get_sub_services(db: Session = Depends(get_db)):
-    sub_services = db.query(SubService).options(joinedload(SubService.service)).all()
+async def get_sub_services(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(SubService).options(joinedload(SubService.service))
+    sub_services = await paginate_async(db, stmt, [SubService.id], page, response, descending=False)
 
     return [
-        {
-            "id": ss.id,
-            "name": ss.name,
-            "description": ss.description,
-            "price": ss.price,
-            "image_url": ss.image_url,
-            "parent_service": {
-                "name": ss.service.name if ss.service else None
-            }
-        } for ss in sub_services
+        {**_sub_service_item(ss), "parent_service": {"name": ss.service.name if ss.service else None}}
+        for ss in sub_services
     ]
 
 
 # UPDATE
 @router.put("/manage/{sub_service_id}")
-def update_sub_service(
+async def update_sub_service(
     sub_service_id: int,
     name: str = Form(...),
     description: str = Form(...),
     price: float = Form(...),
     image: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    sub_service = db.query(SubService).filter(SubService.id == sub_service_id).first()
+    sub_service = await db.scalar(select(SubService).where(SubService.id == sub_service_id))
     if not sub_service:
         raise HTTPException(status_code=404, detail="Sub-service not found")
 
@@ -100,21 +90,12 @@ def update_sub_service(
     sub_service.description = description
     sub_service.price = price
 
-    if image:
-        image_url = save_image(image)
-        sub_service.image_url = image_url
+    await replace_media(db, sub_service, image)
 
-    db.commit()
-    db.refresh(sub_service)
+    await db.commit()
+    await db.refresh(sub_service)
 
-    return {
-        "id": sub_service.id,
-        "name": sub_service.name,
-        "description": sub_service.description,
-        "price": sub_service.price,
-        "image_url": sub_service.image_url,
-        "service_id": sub_service.service_id
-    }
+    return _sub_service_item(sub_service)
 
 # DELETE
 @router.delete("/manage/{sub_service_id}")
@@ -123,6 +104,7 @@ def delete_sub_service(sub_service_id: int, db: Session = Depends(get_db)):
     if not sub_service:
         raise HTTPException(status_code=404, detail="Sub-service not found")
 
+    release_media(db, sub_service.image_url)
     db.delete(sub_service)
     db.commit()
     return {"detail": "Sub-service deleted successfully"}
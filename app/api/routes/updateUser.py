@@ -1,16 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-import os
-import shutil
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import logging
-from datetime import datetime
-from uuid import uuid4
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.db.model.user import User
 from app.schemas.user import UserOut
-from pathlib import Path
+from app.services.uploads import save_image
+from app.crud.media import release_media
 
 router = APIRouter()
 
@@ -18,57 +16,17 @@ router = APIRouter()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure upload directory
-UPLOAD_BASE = Path("uploads")  # Relative to project root
-UPLOAD_DIR = UPLOAD_BASE / "profile_images"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 # Allowed image MIME types
 ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/gif"]
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
-def save_profile_image(user_id: int, image: UploadFile) -> str:
-    """Save profile image and return relative path"""
-    try:
-        # Validate image type
-        if image.content_type not in ALLOWED_IMAGE_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid image type. Allowed types: {', '.join(ALLOWED_IMAGE_TYPES)}"
-            )
+async def save_profile_image(image: UploadFile, db: AsyncSession) -> str:
+    """Save profile image and return its URL.
 
-        # Validate file size
-        file_size = 0
-        for chunk in image.file:
-            file_size += len(chunk)
-            if file_size > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File too large. Max size: {MAX_FILE_SIZE//(1024*1024)}MB"
-                )
-        image.file.seek(0)
-
-        # Generate unique filename
-        ext = os.path.splitext(image.filename)[1]
-        filename = f"user_{user_id}_{uuid4().hex}{ext}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
-        
-        # Return relative path for storage in DB
-        return f"/uploads/profile_images/{filename}"
-        # return f"/uploads/profile_images/{filename}".replace("\\", "/")
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error saving profile image: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to save profile image"
-        )
+    The upload is validated, hashed and size-metered in a single streaming pass
+    off the event loop, and stored in the shared content-addressed media store.
+    """
+    return await save_image(image, db, max_size=MAX_FILE_SIZE, allowed_types=ALLOWED_IMAGE_TYPES)
 
 @router.put("/update/{user_id}", response_model=UserOut)
 async def update_user_profile(
@@ -84,12 +42,12 @@ async def update_user_profile(
     linkedin: Optional[str] = Form(None),
     twitter: Optional[str] = Form(None),
     profile_image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update user profile information"""
     try:
         # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.scalar(select(User).where(User.id == user_id))
         if not user:
             logger.error(f"User with ID {user_id} not found")
             raise HTTPException(status_code=404, detail="User not found")
@@ -120,24 +78,15 @@ async def update_user_profile(
             try:
                 # Handle case when image should be removed (empty string sent)
                 if profile_image.filename == '':
-                    if user.profile_image:
-                        old_image_path = os.path.join(UPLOAD_DIR, os.path.basename(user.profile_image))
-                        if os.path.exists(old_image_path):
-                            os.unlink(old_image_path)
-                            logger.info(f"Deleted old profile image for user {user_id}")
+                    await db.run_sync(release_media, user.profile_image)
                     user.profile_image = None
                     updates['profile_image'] = None
                 # Handle new image upload
                 elif profile_image.filename:
-                    # Delete old image if exists
-                    if user.profile_image:
-                        old_image_path = os.path.join(UPLOAD_DIR, os.path.basename(user.profile_image))
-                        if os.path.exists(old_image_path):
-                            os.unlink(old_image_path)
-                            logger.info(f"Deleted old profile image for user {user_id}")
-
-                    # Save new image
-                    image_path = save_profile_image(user_id, profile_image)
+                    # Save new image, then drop our reference to the old one;
+                    # the media GC removes the file once nothing points at it
+                    image_path = await save_profile_image(profile_image, db)
+                    await db.run_sync(release_media, user.profile_image)
                     user.profile_image = image_path
                     updates['profile_image'] = image_path
                 
@@ -158,17 +107,18 @@ async def update_user_profile(
             )
 
         # Commit changes
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         
         logger.info(f"Successfully updated user {user_id}. Updated fields: {list(updates.keys())}")
         return user
 
     except HTTPException:
+        await db.rollback()
         raise
     except Exception as e:
         logger.error(f"Unexpected error updating user {user_id}: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail="An unexpected error occurred while updating the profile"
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Request, Response
+from app.api.deps import get_current_admin_user
+from app.schemas.upload_session import UploadChunkOut, UploadSessionCreate, UploadSessionOut
+from app.services.jwt import Principal
+from app.services.upload_sessions import create_session, discard_session, session_status, write_chunk
+
+router = APIRouter(prefix="/upload-sessions", tags=["Uploads"])
+
+# Protocol: create a session, PUT each chunk (raw bytes at offset index * chunk_size,
+# in any order and in parallel), re-check status to resend what is missing, then
+# pass `upload_id` to POST/PUT /gallery, /banners or /news instead of a file.
+# Sessions belong to the admin who opened them; other users get 404.
+
+# ------------------ Create Upload Session ------------------
+@router.post("/", response_model=UploadSessionOut, status_code=201)
+async def create_upload_session(
+    payload: UploadSessionCreate,
+    current_user: Principal = Depends(get_current_admin_user),
+):
+    return await create_session(payload.filename, payload.content_type, payload.size, owner=current_user.id)
+
+# ------------------ Upload Session Status ------------------
+@router.get("/{upload_id}", response_model=UploadSessionOut)
+async def get_upload_session(upload_id: str, current_user: Principal = Depends(get_current_admin_user)):
+    return await session_status(upload_id, owner=current_user.id)
+
+# ------------------ Upload Chunk ------------------
+@router.put("/{upload_id}/chunks/{index}", response_model=UploadChunkOut)
+async def upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_admin_user),
+):
+    return await write_chunk(upload_id, index, request.stream(), owner=current_user.id)
+
+# ------------------ Abort Upload Session ------------------
+@router.delete("/{upload_id}", status_code=204)
+async def abort_upload_session(upload_id: str, current_user: Principal = Depends(get_current_admin_user)):
+    await session_status(upload_id, owner=current_user.id)
+    await discard_session(upload_id)
+    return Response(status_code=204)
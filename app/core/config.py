@@ -1,21 +1,133 @@
 
-from pydantic import BaseSettings
+import secrets
+from typing import Optional
+from pydantic import BaseSettings, root_validator
+
+# Settings with local defaults that a production deployment must set explicitly
+REQUIRED_IN_PRODUCTION = (
+    "DATABASE_URL", "EMAIL_HOST", "EMAIL_PORT", "EMAIL_USERNAME", "EMAIL_PASSWORD",
+    "EMAIL_FROM", "EMAIL_FROM_NAME", "SECRET_KEY", "FRONTEND_URL",
+)
 
 class Settings(BaseSettings):
-    DATABASE_URL: str
-    EMAIL_HOST: str
-    EMAIL_PORT: int
-    EMAIL_USERNAME: str
-    EMAIL_PASSWORD: str
-    EMAIL_FROM: str
-    EMAIL_FROM_NAME: str
-    SECRET_KEY: str
-    FRONTEND_URL: str
-    ENVIRONMENT: str
+    # Defaults are the offline local profile (app/db/profile.py): an empty
+    # environment starts the app on a SQLite file, with mail going to an SMTP
+    # server on localhost and a SECRET_KEY generated per process, so tokens
+    # don't survive a restart. ENVIRONMENT=production requires them all.
+    DATABASE_URL: Optional[str] = None  # unset outside production means a local SQLite file
+    EMAIL_HOST: str = "localhost"
+    EMAIL_PORT: int = 25
+    EMAIL_USERNAME: str = ""
+    EMAIL_PASSWORD: str = ""
+    EMAIL_FROM: str = "noreply@localhost"
+    EMAIL_FROM_NAME: str = "Local"
+    SECRET_KEY: str = ""
+    FRONTEND_URL: str = "http://localhost:3000"
+    ENVIRONMENT: str = "development"
+
+    # Orphaned upload collector (app/services/media_gc.py)
+    MEDIA_GC_INTERVAL_SECONDS: int = 6 * 60 * 60
+    MEDIA_GC_GRACE_SECONDS: int = 60 * 60
+    MEDIA_GC_BATCH_SIZE: int = 50
+    MEDIA_GC_PAUSE_SECONDS: float = 1.0
+
+    # Processes per uvicorn worker for image resizing (app/services/images.py)
+    IMAGE_WORKERS: int = 2
+
+    # Processes per uvicorn worker for bcrypt (app/services/passwords.py), and how many
+    # more calls may wait for one before requests get a 503; 0 workers hashes inline
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 8
+
+    # On-demand resize cache behind /media/{category}/{file} (app/services/image_cache.py)
+    MEDIA_CACHE_DIR: str = ""  # defaults to <project>/.media_cache
+    MEDIA_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Resumable chunked uploads (app/services/upload_sessions.py); expired sessions
+    # are purged on their own schedule unless the TTL is 0. Sessions take files up
+    # to UPLOAD_SESSION_MAX_BYTES, single multipart uploads stop at 10MB.
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_SESSION_MAX_BYTES: int = 100 * 1024 * 1024
+    UPLOAD_SESSION_TTL_SECONDS: int = 24 * 60 * 60
+    UPLOAD_SESSIONS_PER_CLIENT: int = 10
+
+    # Uvicorn worker processes; 0 means 4 in production and 1 otherwise
+    WEB_CONCURRENCY: int = 0
+
+    # Database connection pools (app/db/pool.py). Every worker runs a sync and
+    # an async engine against each server (primary, and the replica if set).
+    # Unless DB_POOL_SIZE / DB_MAX_OVERFLOW are set, each engine's size +
+    # overflow is its share of DB_CONNECTION_BUDGET, which should be the
+    # server's max_connections less headroom for migrations, psql and other
+    # clients: the default fits PostgreSQL's stock max_connections=100.
+    # Each engine still gets at least DB_POOL_MIN_SIZE + DB_POOL_MIN_OVERFLOW
+    # (SQLAlchemy's own defaults are 5 + 10); a budget too small for that is
+    # logged at startup, raise max_connections or lower WEB_CONCURRENCY.
+    DB_CONNECTION_BUDGET: int = 90
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_MIN_SIZE: int = 5
+    DB_POOL_MIN_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+
+    # Read replica for GET requests (app/db/routing.py); unset means everything uses the primary
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
+    DB_REPLICA_RETRY_SECONDS: int = 30
+
+    # Per-request SQL counters (app/db/query_stats.py). A statement shape that
+    # repeats more than SQL_REPEAT_THRESHOLD times in one request is logged, or
+    # raised when SQL_REPEAT_RAISE is set outside production.
+    SQL_INSTRUMENTATION: bool = True
+    SQL_REPEAT_THRESHOLD: int = 10
+    SQL_REPEAT_RAISE: bool = False
+
+    # Stored responses for replayed Idempotency-Key requests (app/middleware/idempotency.py);
+    # a key whose request never finished is free again after IDEMPOTENCY_LEASE_SECONDS
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_LEASE_SECONDS: int = 60
+
+    # Public catalog response cache (app/services/response_cache.py); either at 0 disables it.
+    # Writes only invalidate the worker that made them unless REDIS_URL is set, so with
+    # several workers and no Redis the TTL is capped at RESPONSE_CACHE_UNSHARED_TTL_SECONDS.
+    RESPONSE_CACHE_TTL_SECONDS: int = 5 * 60
+    RESPONSE_CACHE_UNSHARED_TTL_SECONDS: int = 5
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Shared response cache and cross-worker invalidation (app/services/redis_cache.py);
+    # unset means each worker caches on its own
+    REDIS_URL: Optional[str] = None
+
+    # Per-worker user id -> (email, role) cache behind token checks (app/services/identity_cache.py);
+    # bounds how long another worker's role change or deletion takes to apply here
+    IDENTITY_CACHE_TTL_SECONDS: int = 60
+    IDENTITY_CACHE_MAX_ENTRIES: int = 10_000
 
     class Config:
         env_file = ".env"
 
+    @root_validator(pre=True)
+    def _require_production_settings(cls, values):
+        if values.get("ENVIRONMENT") == "production":
+            missing = [name for name in REQUIRED_IN_PRODUCTION if not values.get(name)]
+            if missing:
+                raise ValueError(f"Required in production: {', '.join(missing)}")
+        return values
+
+    @root_validator
+    def _local_secret_key(cls, values):
+        if not values.get("SECRET_KEY"):
+            values["SECRET_KEY"] = secrets.token_urlsafe(32)
+        return values
+
+    @property
+    def worker_count(self) -> int:
+        if self.WEB_CONCURRENCY > 0:
+            return self.WEB_CONCURRENCY
+        return 4 if self.ENVIRONMENT == "production" else 1
+
 settings = Settings()
 
 
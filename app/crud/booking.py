@@ -1,32 +1,70 @@
+from typing import Any, Dict
+
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+from app.db.bulk import insert_returning
 from app.db.model.booking import Booking, BookingItem
+from app.db.model.loyalty_point import LoyaltyPointTransaction
+from app.db.model.user import User
 from app.schemas.booking import BookingCreate
 
+# Points credited for every booking, before any redemption
+BOOKING_POINTS = 10
+
+
+def create_booking(db: Session, booking_data: BookingCreate) -> Dict[str, Any]:
+    """Insert a booking and its items with RETURNING; the caller commits.
+
+    Returns the stored booking as a dict with its `items`, ready for
+    BookingResponse, without loading anything into the session.
+    """
+    booking = insert_returning(db, Booking, [{
+        "user_id": booking_data.user_id,
+        "contact_info": booking_data.contact_info,
+        "date": booking_data.date,
+        "time": booking_data.time,
+        "total_amount": booking_data.total_amount,
+        "notes": booking_data.notes,
+        "status": "pending",
+        "points_used": booking_data.points_used or 0,
+    }])[0]
 
-def create_booking(db: Session, booking_data: BookingCreate):
-    booking = Booking(
-        user_id=booking_data.user_id,
-        contact_info=booking_data.contact_info,
-        date=booking_data.date,
-        time=booking_data.time,
-        total_amount=booking_data.total_amount,
+    items = insert_returning(db, BookingItem, [
+        {
+            "booking_id": booking.id,
+            "sub_service_id": item.sub_service_id,
+            "name": item.name,
+            "price": item.price,
+            "quantity": item.quantity,
+        }
+        for item in booking_data.items
+    ])
+    return {**booking._mapping, "items": [dict(item._mapping) for item in items]}
+
+
+def apply_booking_points(db: Session, user_id, booking_id: int, points_used: int = 0) -> bool:
+    """Credit BOOKING_POINTS and redeem `points_used` in one conditional UPDATE.
+
+    The balance check happens in the WHERE clause, so two bookings racing for
+    the same points can't both spend them. Returns False when the user can't
+    cover `points_used`; the caller should roll back. A missing user with
+    nothing to redeem is skipped, as before.
+    """
+    delta = BOOKING_POINTS - points_used
+    result = db.execute(
+        update(User)
+        .where(User.id == user_id, User.loyalty_points + BOOKING_POINTS >= points_used)
+        .values(loyalty_points=User.loyalty_points + delta)
+        .execution_options(synchronize_session=False)
     )
-    db.add(booking)
-    db.flush()
-
-    for item in booking_data.items:
-        booking_item = BookingItem(
-            booking_id=booking.id,
-            sub_service_id=item.sub_service_id,
-            name=item.name,
-            price=item.price,
-            quantity=item.quantity,
-        )
-        db.add(booking_item)
-
-    db.commit()
-    db.refresh(booking)
-    return booking
+    if result.rowcount == 0:
+        return points_used <= 0
+
+    transactions = [{"user_id": user_id, "points": BOOKING_POINTS, "reason": "booking", "related_id": booking_id}]
+    if points_used > 0:
+        transactions.append({"user_id": user_id, "points": -points_used, "reason": "redeem", "related_id": booking_id})
+    db.execute(insert(LoyaltyPointTransaction), transactions)
+    return True
 
 
 def get_bookings_by_user(db: Session, user_id: str):
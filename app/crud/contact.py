@@ -11,21 +11,21 @@ def create_contact(db: Session, contact_data: ContactForm):
     db.refresh(contact)
     return contact
 
-def get_user_messages(db: Session, user_id: int, status: str = None):
+def query_user_messages(db: Session, user_id: int, status: str = None):
     query = db.query(ContactModel).filter(ContactModel.user_id == user_id)
     
     if status and status != 'all':
         query = query.filter(ContactModel.status == status)
 
-    return query.order_by(ContactModel.created_at.desc()).all()
+    return query
 
-def get_all_messages(db: Session, status: Optional[str] = None) -> List[ContactModel]:
+def query_all_messages(db: Session, status: Optional[str] = None):
     query = db.query(ContactModel)
 
     if status and status != 'all':
         query = query.filter(ContactModel.status == status)
 
-    return query.order_by(ContactModel.created_at.desc()).all()
+    return query
 
 def reply_to_contact(db: Session, contact_id: int, response: str, status: str):
     contact = db.query(ContactModel).filter(ContactModel.id == contact_id).first()
@@ -0,0 +1,74 @@
+# app/crud/idempotency.py
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db.model.idempotency import IdempotencyKey
+
+
+def claim_key(db: Session, key: str, request_hash: str, lease_until: datetime) -> Optional[IdempotencyKey]:
+    """Claim `key` for a new request. Returns None if claimed, else the row that already holds it.
+
+    The claim expires at `lease_until` unless store_response() keeps it, so a
+    request whose worker died doesn't hold the key for the whole TTL. The
+    primary key does the locking: a concurrent duplicate blocks on the insert
+    until the first claim commits and then gets that row back.
+    """
+    db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.key == key, IdempotencyKey.expires_at < datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        with db.begin_nested():
+            db.add(IdempotencyKey(key=key, request_hash=request_hash, expires_at=lease_until))
+        return None
+    except IntegrityError:
+        return db.get(IdempotencyKey, key)
+
+
+def _claimed(key: str, lease_until: datetime):
+    # Only the claim made with this lease; once it lapsed the key may belong to a retry
+    return (IdempotencyKey.key == key) & (IdempotencyKey.expires_at == lease_until)
+
+
+def store_response(
+    db: Session,
+    key: str,
+    lease_until: datetime,
+    ttl_seconds: int,
+    status_code: int,
+    content_type: Optional[str],
+    body: bytes,
+) -> None:
+    """Record the response to replay and keep the key for `ttl_seconds`."""
+    db.execute(
+        update(IdempotencyKey)
+        .where(_claimed(key, lease_until))
+        .values(
+            status_code=status_code,
+            content_type=content_type,
+            body=body,
+            expires_at=datetime.utcnow() + timedelta(seconds=ttl_seconds),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_key(db: Session, key: str, lease_until: datetime) -> None:
+    """Forget a claim whose request failed, so the client's retry runs again."""
+    db.execute(
+        delete(IdempotencyKey)
+        .where(_claimed(key, lease_until))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_expired_keys(db: Session) -> int:
+    result = db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.expires_at < datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
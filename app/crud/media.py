@@ -0,0 +1,40 @@
+# app/crud/media.py
+import logging
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db.model.media import MediaBlob
+
+logger = logging.getLogger(__name__)
+
+
+def acquire_media(db: Session, sha256: str, url: str, size: int, content_type: Optional[str] = None) -> None:
+    """Record one more reference to a stored blob, creating its row on first use."""
+    bump = (
+        update(MediaBlob)
+        .where(MediaBlob.sha256 == sha256)
+        .values(ref_count=MediaBlob.ref_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(bump).rowcount:
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(MediaBlob(sha256=sha256, url=url, size=size, content_type=content_type, ref_count=1))
+    except IntegrityError:
+        # Another request stored the same bytes first; count against its row
+        db.execute(bump)
+
+
+def release_media(db: Session, url: Optional[str]) -> None:
+    """Drop one reference to the blob behind `url`. Unreferenced blobs are left for the GC."""
+    if not url:
+        return
+    db.execute(
+        update(MediaBlob)
+        .where(MediaBlob.url == url, MediaBlob.ref_count > 0)
+        .values(ref_count=MediaBlob.ref_count - 1)
+        .execution_options(synchronize_session=False)
+    )
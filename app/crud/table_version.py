@@ -0,0 +1,51 @@
+# app/crud/table_version.py
+from datetime import datetime
+from typing import Dict, Iterable, Set, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db.changes import before_commit
+from app.db.model.table_version import TableVersion
+
+
+def bump_versions(db: Session, tables: Iterable[str]) -> None:
+    """Advance the version of each table; rows are created on first write."""
+    tables = set(tables)
+    now = datetime.utcnow()
+    bumped = db.execute(
+        update(TableVersion)
+        .where(TableVersion.name.in_(tables))
+        .values(version=TableVersion.version + 1, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    missing = set()
+    if bumped.rowcount != len(tables):
+        existing = db.execute(select(TableVersion.name).where(TableVersion.name.in_(tables))).scalars()
+        missing = tables - set(existing)
+    for name in missing:
+        try:
+            with db.begin_nested():
+                db.add(TableVersion(name=name, version=1, updated_at=now))
+        except IntegrityError:
+            # Created by a concurrent writer; count this write against its row
+            bump_versions(db, [name])
+
+
+def read_versions(db: Session, tables: Iterable[str]) -> Dict[str, Tuple[int, datetime]]:
+    """(version, updated_at) for each table that has been written at least once."""
+    rows = db.execute(
+        select(TableVersion.name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.name.in_(list(tables)))
+    )
+    return {name: (version, updated_at) for name, version, updated_at in rows}
+
+
+def track_table_versions(tables: Set[str]) -> None:
+    """Bump the versions of `tables` in every transaction that writes to them."""
+    tables = frozenset(tables)
+
+    def bump(db: Session, written: Set[str]) -> None:
+        if written & tables:
+            bump_versions(db, written & tables)
+
+    before_commit(bump)
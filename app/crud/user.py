@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.db.model.user import User
 from app.schemas.user import UserCreate, AdminCreateUser
-from app.core.security import get_password_hash
+from app.services.passwords import get_password_hash
 
 # Set up logging for CRUD operations
 logger = logging.getLogger(__name__)
@@ -12,6 +12,10 @@ logger = logging.getLogger(__name__)
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+def get_user_identity(db: Session, user_id: int):
+    """Just the email and role of a user, or None; enough to authorize a token."""
+    return db.query(User.email, User.role).filter(User.id == user_id).first()
+
 def get_user_by_id(db: Session, user_id: int):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -33,6 +37,9 @@ def create_user(db: Session, user_in: UserCreate):
         db.refresh(user)
         logger.info(f"User created: {user.email}")
         return user
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating user: {e}")
@@ -59,6 +66,9 @@ def create_user_by_admin(db: Session, user_in: AdminCreateUser):
         db.refresh(user)
         logger.info(f"Admin created user: {user.email} with role {user.role}")
         return user
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating user by admin: {e}")
@@ -0,0 +1,27 @@
+# app/db/bulk.py
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+
+def insert_returning(db: Session, model, rows: Sequence[Dict[str, Any]]) -> List[Any]:
+    """Insert `rows` into `model`'s table and return the stored rows, in input order.
+
+    On backends with multi-row RETURNING (PostgreSQL) this is a single
+    INSERT ... VALUES (...), (...) RETURNING * round trip. Other dialects fall
+    back to one INSERT per row followed by a single SELECT of the new keys.
+    Rows are not added to the session identity map.
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    if db.get_bind().dialect.full_returning:
+        result = db.execute(insert(table).values(list(rows)).returning(*table.c))
+        return result.fetchall()
+
+    pk = table.primary_key.columns.values()[0]
+    ids = [db.execute(insert(table).values(**row)).inserted_primary_key[0] for row in rows]
+    stored = {row._mapping[pk.key]: row for row in db.execute(select(table).where(pk.in_(ids)))}
+    return [stored[i] for i in ids]
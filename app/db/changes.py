@@ -0,0 +1,83 @@
+# app/db/changes.py
+import logging
+from typing import Callable, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+WRITTEN_TABLES = "written_tables"
+
+_listeners: List[Callable[[Set[str]], None]] = []
+_before_commit_listeners: List[Callable[[Session, Set[str]], None]] = []
+
+
+def on_commit(listener: Callable[[Set[str]], None]) -> None:
+    """Call `listener(tables)` after every commit that wrote to `tables`."""
+    _listeners.append(listener)
+
+
+def before_commit(listener: Callable[[Session, Set[str]], None]) -> None:
+    """Call `listener(session, tables)` inside each writing transaction, just before it commits.
+
+    The listener may execute statements of its own; they commit (or roll back)
+    together with the writes.
+    """
+    _before_commit_listeners.append(listener)
+
+
+def _written(session: Session) -> Set[str]:
+    return session.info.setdefault(WRITTEN_TABLES, set())
+
+
+def _after_flush(session, flush_context):
+    tables = _written(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            tables.add(table.name)
+
+
+def _do_orm_execute(state):
+    # Bulk and Core DML through Session.execute(): insert_returning(), query.delete(), update(Model)...
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            _written(state.session).add(table.name)
+
+
+def _before_commit(session):
+    # Savepoint releases fire this too; only the outermost commit counts
+    if not _before_commit_listeners or session.in_nested_transaction():
+        return
+    # Flush now so objects still pending at commit are part of `tables`
+    session.flush()
+    tables = set(session.info.get(WRITTEN_TABLES, ()))
+    if tables:
+        for listener in _before_commit_listeners:
+            listener(session, tables)
+
+
+def _after_commit(session):
+    tables = session.info.pop(WRITTEN_TABLES, None)
+    if not tables:
+        return
+    for listener in _listeners:
+        try:
+            listener(tables)
+        except Exception as e:
+            logger.error(f"Commit listener failed for {sorted(tables)}: {e}")
+
+
+def track_writes() -> None:
+    """Record which tables each session writes so on_commit() listeners hear about them.
+
+    Tables from a rolled-back transaction stay recorded until the session's
+    next commit; listeners only ever see too many tables, never too few.
+    """
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "before_commit", _before_commit)
+        event.listen(Session, "after_commit", _after_commit)
@@ -0,0 +1,27 @@
+# app/db/init_db.py
+import logging
+
+from app.db.base import Base
+# Every model module, so create_all() sees every table
+from app.db.model import (
+    user, service, sub_service, booking, banner,
+    pastevent, gallery, news, chats, contact, loyalty_point, teams, testimonial, getintouch,
+    media, idempotency, table_version,
+)
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+def create_schema(bind=engine) -> None:
+    """Create all tables and indexes from the models in one step; existing tables are left alone.
+
+    This is for local SQLite databases, tests and benchmarks. Postgres
+    deployments are migrated with alembic.
+    """
+    Base.metadata.create_all(bind)
+    logger.info(f"Schema ready on {bind.url.render_as_string(hide_password=True)}")
+
+
+if __name__ == "__main__":
+    create_schema()
@@ -1,6 +1,6 @@
 
 # app/db/model/service.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, JSON
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -9,5 +9,7 @@ class BannerModel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
-    description = Column(String, index=True)
-    image_url = Column(String, nullable=True)
\ No newline at end of file
+    description = Column(String)
+    image_url = Column(String, nullable=True)
+    image_variants = Column(JSON, nullable=True)
+    image_meta = Column(JSON, nullable=True)
\ No newline at end of file
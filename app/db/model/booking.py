@@ -1,6 +1,6 @@
 
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Time, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Time, Text, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -24,11 +24,19 @@ class Booking(Base):
     customer = relationship("User", foreign_keys=[user_id], back_populates="customer_bookings")
     technician = relationship("User", foreign_keys=[technician_id], back_populates="technician_bookings")
 
+    __table_args__ = (
+        # Booking lists page on (date, time, id); the leading column is each list's filter
+        Index("ix_bookings_date_time", "date", "time", "id"),
+        Index("ix_bookings_status_date_time", "status", "date", "time", "id"),
+        Index("ix_bookings_user_id_date_time", "user_id", "date", "time", "id"),
+        Index("ix_bookings_technician_id", "technician_id"),
+    )
+
 class BookingItem(Base):
     __tablename__ = "booking_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    booking_id = Column(Integer, ForeignKey("bookings.id"))
+    booking_id = Column(Integer, ForeignKey("bookings.id"), index=True)
     sub_service_id = Column(Integer)
     name = Column(String)
     price = Column(Float)
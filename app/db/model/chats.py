@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -16,6 +16,11 @@ class ChatMessage(Base):
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     is_admin = Column(Boolean, default=False)
     reply_to = Column(String, ForeignKey('chat_messages.id'), nullable=True)
+
+    __table_args__ = (
+        Index("ix_chat_messages_recipient_timestamp", "recipient", "timestamp"),
+        Index("ix_chat_messages_timestamp", "timestamp", "id"),
+    )
     
     def __repr__(self):
         return f"<ChatMessage(id={self.id}, sender='{self.sender}', recipient='{self.recipient}', timestamp={self.timestamp})>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum
@@ -16,11 +16,17 @@ class ContactModel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     subject = Column(String(255), index=True)
-    message = Column(String(2000), index=True)  
+    message = Column(String(2000))
     status = Column(String(50), index=True, default=ContactStatus.PENDING)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     user_name = Column(String(100), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     reply = Column(String(2000), nullable=True)
 
+    __table_args__ = (
+        # /contacts/me and /contacts/admin page newest first on (created_at, id)
+        Index("ix_contact_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_contact_created_at", "created_at", "id"),
+    )
+
     # user = relationship("User", back_populates="contacts")
\ No newline at end of file
@@ -10,6 +10,6 @@ class GetintouchModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True)
     email = Column(String(255), index=True)
-    message = Column(String(2000), index=True)
+    message = Column(String(2000))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
@@ -0,0 +1,17 @@
+# app/db/model/idempotency.py
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from app.db.base import Base
+
+class IdempotencyKey(Base):
+    """A claimed Idempotency-Key and, once the request finished, the response to replay."""
+    __tablename__ = "idempotency_keys"
+
+    # SHA-256 of method, path, Authorization header and the client's key, so keys
+    # never collide across endpoints or callers
+    key = Column(String(64), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is still running
+    content_type = Column(String(100), nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    # The claim's short lease while running, then the replay TTL once the response is stored
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base_class import Base
@@ -15,3 +15,7 @@ class LoyaltyPointTransaction(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="point_transactions")
+
+    __table_args__ = (
+        Index("ix_loyalty_point_transactions_user_id_created_at", "user_id", "created_at", "id"),
+    )
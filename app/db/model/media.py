@@ -0,0 +1,16 @@
+# app/db/model/media.py
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.db.base import Base
+
+class MediaBlob(Base):
+    """One stored upload, named by the SHA-256 of its bytes and shared by every row that points at it."""
+    __tablename__ = "media_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    url = Column(String, unique=True, nullable=False)
+    content_type = Column(String(50), nullable=True)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
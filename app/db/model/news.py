@@ -2,7 +2,7 @@
 
 
 # app/db/model/service.py
-from sqlalchemy import Column, Integer, String , DateTime
+from sqlalchemy import Column, Integer, String , DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -12,8 +12,14 @@ class NewsModel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
-    description = Column(String, index=True)
+    description = Column(String)
     category = Column(String, index=True)
-    content = Column(String, index=True)
+    content = Column(String)
     image_url = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    image_variants = Column(JSON, nullable=True)
+    image_meta = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_news_created_at", "created_at", "id"),
+    )
\ No newline at end of file
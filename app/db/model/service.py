@@ -1,5 +1,5 @@
 # app/db/model/service.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, JSON
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -8,8 +8,10 @@ class ServiceModel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
-    description = Column(String, index=True)
+    description = Column(String)
     slug = Column(String, unique=True, index=True)  # <-- Add this
     image_url = Column(String, nullable=True)
+    image_variants = Column(JSON, nullable=True)
+    image_meta = Column(JSON, nullable=True)
 
     sub_services = relationship("SubService", back_populates="service", cascade="all, delete-orphan")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base  # Adjust import as necessary
 
@@ -10,6 +10,8 @@ class SubService(Base):
     description = Column(String)
     price = Column(Integer)
     image_url = Column(String)
+    image_variants = Column(JSON, nullable=True)
+    image_meta = Column(JSON, nullable=True)
 
     service_id = Column(Integer, ForeignKey("services.id"))  # Foreign key to services table
 
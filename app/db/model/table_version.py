@@ -0,0 +1,12 @@
+# app/db/model/table_version.py
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.db.base import Base
+
+class TableVersion(Base):
+    """Write counter for one content table, bumped in the same transaction as the write."""
+    __tablename__ = "table_versions"
+
+    name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
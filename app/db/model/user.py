@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base_class import Base
@@ -47,6 +47,11 @@ class User(Base):
     cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # /auth/users and /auth/technicians filter on role and page on id
+        Index("ix_user_role", "role", "id"),
+    )
+
 
     # In your User model
 # contacts = relationship("ContactModel", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
@@ -0,0 +1,145 @@
+# app/db/pool.py
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Engines opened by each worker process (sync + async)
+ENGINES_PER_WORKER = 2
+
+
+def _pool_sizes(settings: Settings, engines: int = ENGINES_PER_WORKER) -> Tuple[int, int]:
+    """(pool_size, max_overflow) for one engine; see pool_options()."""
+    share = max(settings.DB_CONNECTION_BUDGET // (settings.worker_count * engines), 1)
+    pool_size = settings.DB_POOL_SIZE
+    if pool_size is None:
+        pool_size = max(share // 2, settings.DB_POOL_MIN_SIZE)
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if max_overflow is None:
+        max_overflow = max(share - pool_size, settings.DB_POOL_MIN_OVERFLOW)
+    return pool_size, max_overflow
+
+
+def pool_options(settings: Settings, engines: int = ENGINES_PER_WORKER) -> Dict:
+    """create_engine() pool arguments for one engine, sized from the connection budget.
+
+    The budget is split evenly across workers and engines. Half of each share
+    is kept open as the pool, the rest is overflow that is closed again when
+    the burst is over. Neither goes below the DB_POOL_MIN_* floors; if the
+    floors don't fit in the budget a warning says so, since the server will
+    refuse connections before the pools fill.
+    """
+    engines_total = settings.worker_count * engines
+    pool_size, max_overflow = _pool_sizes(settings, engines)
+    if engines_total * (pool_size + max_overflow) > settings.DB_CONNECTION_BUDGET:
+        logger.warning(
+            f"{engines_total} engines x {pool_size + max_overflow} connections exceeds "
+            f"DB_CONNECTION_BUDGET={settings.DB_CONNECTION_BUDGET}"
+        )
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+class PoolStats:
+    """Checkout wait-time counters for one pool, shared across its recreations."""
+
+    def __init__(self, name: str, warn_after: float, max_overflow: int):
+        self.name = name
+        self.warn_after = warn_after
+        # As configured; QueuePool keeps its own copy private
+        self.max_overflow = max_overflow
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.last_wait_seconds = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            self.last_wait_seconds = waited
+        if waited >= self.warn_after:
+            logger.warning(f"Waited {waited:.2f}s for a '{self.name}' database connection")
+
+
+class _TimedCheckoutMixin:
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.stats is not None:
+                self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.stats is not None:
+            self.stats.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_instrumented: List = []
+
+
+def instrument(engine, name: str, settings: Settings):
+    """Attach PoolStats to an engine built with one of the instrumented pool classes."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    sync_engine.pool.stats = PoolStats(
+        name, warn_after=settings.DB_POOL_TIMEOUT / 2, max_overflow=_pool_sizes(settings)[1]
+    )
+    _instrumented.append(sync_engine)
+    return engine
+
+
+def pool_metrics() -> Dict:
+    """Gauges for every instrumented pool in this worker process."""
+    pools = {}
+    for engine in _instrumented:
+        pool = engine.pool
+        stats = pool.stats
+        pools[stats.name] = {
+            "size": pool.size(),
+            "max_overflow": stats.max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_seconds_avg": stats.wait_seconds_total / stats.checkouts if stats.checkouts else 0.0,
+            "wait_seconds_max": stats.wait_seconds_max,
+            "last_wait_seconds": stats.last_wait_seconds,
+        }
+    return {"pid": os.getpid(), "pools": pools}
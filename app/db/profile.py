@@ -0,0 +1,81 @@
+# app/db/profile.py
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+
+from app.core.config import Settings
+from app.db.pool import pool_options
+
+logger = logging.getLogger(__name__)
+
+# Used when DATABASE_URL is unset outside production, e.g. for offline tests and benchmarks
+LOCAL_SQLITE_URL = f"sqlite:///{Path(__file__).resolve().parents[2] / 'local.db'}"
+
+# WAL lets readers run alongside the single writer; NORMAL skips the fsync per
+# commit, which WAL makes safe against corruption (only the last commits can
+# be lost on power failure). Foreign keys are enforced like Postgres does.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def resolve_database_url(url: Optional[str], settings: Settings) -> str:
+    if url:
+        return url
+    if settings.ENVIRONMENT == "production":
+        raise ValueError("DATABASE_URL is not set. Please check your .env file.")
+    logger.warning(f"DATABASE_URL is not set; using the local SQLite database {LOCAL_SQLITE_URL}")
+    return LOCAL_SQLITE_URL
+
+
+def is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_url(url: str) -> URL:
+    """The URL engines are created with.
+
+    An in-memory SQLite database is private to one connection, so it becomes a
+    named shared-cache database that every pooled connection, sync and async,
+    opens together.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        return url
+    query = dict(url.query)
+    query.update({"mode": "memory", "cache": "shared", "uri": "true"})
+    return url.set(database="file:app_memdb", query=query)
+
+
+def engine_options(url, settings: Settings) -> Dict:
+    """create_engine() keyword arguments suited to the database behind `url`."""
+    options = pool_options(settings)
+    if is_sqlite(url):
+        options.update(
+            # Pooled connections move between threads (and aiosqlite's worker thread)
+            connect_args={"check_same_thread": False},
+            # Local files don't drop idle connections, and recycling the last
+            # connection to a shared-cache memory database would discard it
+            pool_recycle=-1,
+            pool_pre_ping=False,
+        )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def configure_engine(engine) -> None:
+    """Dialect-specific connection setup; a no-op for Postgres."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
@@ -0,0 +1,83 @@
+# app/db/query_stats.py
+import re
+import time
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Literals and bind placeholders collapse to "?" so one statement shape gets one fingerprint
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))*\s*\)")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|(?<![:\w]):\w+|\b\d+\b|'(?:[^']|'')*'")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised in development when one statement shape runs too often in a single request."""
+
+
+def fingerprint(statement: str) -> str:
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _IN_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class QueryStats:
+    """Queries executed while handling one request."""
+
+    def __init__(self, repeat_threshold: int, raise_on_repeat: bool = False):
+        self.repeat_threshold = repeat_threshold
+        self.raise_on_repeat = raise_on_repeat
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        shape = fingerprint(statement)
+        self.fingerprints[shape] += 1
+        if self.raise_on_repeat and self.fingerprints[shape] == self.repeat_threshold + 1:
+            raise RepeatedQueryError(
+                f"Statement ran more than {self.repeat_threshold} times in one request (N+1?): {shape}"
+            )
+
+    def repeated(self):
+        """(fingerprint, count) pairs above the repeat threshold, most frequent first."""
+        return [(shape, n) for shape, n in self.fingerprints.most_common() if n > self.repeat_threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request_stats(stats: QueryStats):
+    return _current.set(stats)
+
+
+def end_request_stats(token) -> None:
+    _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    start = conn.info.pop("query_start", None)
+    if start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+def track_queries(engine) -> None:
+    """Count and time every statement `engine` runs inside an instrumented request."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
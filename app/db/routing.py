@@ -0,0 +1,86 @@
+# app/db/routing.py
+import time
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Set per request by ReadReplicaMiddleware: True when the request may read from the replica
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+def allow_replica_reads(allowed: bool):
+    """Route this context's reads to the replica (or not). Returns a token for reset_replica_reads()."""
+    return _replica_reads.set(allowed)
+
+
+def reset_replica_reads(token) -> None:
+    _replica_reads.reset(token)
+
+
+class ReplicaHealth:
+    """Takes the replica out of rotation for `retry_seconds` after it fails to connect."""
+
+    def __init__(self, retry_seconds: float):
+        self.retry_seconds = retry_seconds
+        self.down_until = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, error: Exception) -> None:
+        if self.available():
+            logger.warning(f"Read replica unavailable, using the primary for {self.retry_seconds}s: {error}")
+        self.down_until = time.monotonic() + self.retry_seconds
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica when the current request allows it.
+
+    Writes, flushes and everything after the first write in a session go to the
+    primary, so a request always reads its own writes. If the replica can't be
+    reached the statement is retried on the primary and the replica is skipped
+    until it has been down for `ReplicaHealth.retry_seconds`.
+    """
+
+    primary = None
+    replica = None
+    health: Optional[ReplicaHealth] = None
+
+    _wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if clause is not None and getattr(clause, "is_dml", False):
+            self._wrote = True
+        if self._flushing:
+            self._wrote = True
+        if (
+            self.replica is not None
+            and not self._wrote
+            and _replica_reads.get()
+            and self.health.available()
+        ):
+            return self.replica
+        return self.primary
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        if self.replica is None or engine is not self.replica:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        try:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        except DBAPIError as e:
+            self.health.mark_down(e)
+            return super()._connection_for_bind(self.primary, execution_options, **kw)
+
+
+def routing_session_class(primary, replica=None, health: Optional[ReplicaHealth] = None):
+    """A RoutingSession subclass bound to these (sync) engines."""
+    return type(
+        "BoundRoutingSession",
+        (RoutingSession,),
+        {"primary": primary, "replica": replica, "health": health},
+    )
@@ -1,45 +1,166 @@
 # app/db/session.py
 
+from contextlib import asynccontextmanager, contextmanager
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base  # Import Base from declarative
 from dotenv import load_dotenv
 import os
 import logging
-from sqlalchemy.pool import QueuePool
+from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument
+from app.db.profile import configure_engine, engine_options, engine_url, resolve_database_url
+from app.db.routing import ReplicaHealth, routing_session_class
+from app.db.query_stats import track_queries
+from app.db.changes import track_writes
 
 # Load environment variables
 load_dotenv()
 
-# Fetch the database URL from the environment variables
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-# Check if DATABASE_URL exists
-if DATABASE_URL is None:
-    raise ValueError("DATABASE_URL is not set. Please check your .env file.")
-
 # Set up logging for better error handling
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Fetch the database URL from the environment; required in production,
+# otherwise a local SQLite file is used (app/db/profile.py)
+DATABASE_URL = resolve_database_url(os.getenv("DATABASE_URL"), settings)
+
 # Log the database URL for debugging (mask for security)
 logger.debug(f"Using DATABASE_URL: {DATABASE_URL[:50]}...")
 
-# Create the database engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=10,  # Adjust based on your requirements
-    max_overflow=20,  # Allows overflow connections
-    pool_timeout=30  # Timeout for connections
+# Create the database engine with connection pooling, sized from Settings and
+# tuned for its dialect (SQLite pragmas, shared-cache memory databases)
+engine = instrument(
+    create_engine(engine_url(DATABASE_URL), poolclass=InstrumentedQueuePool, **engine_options(DATABASE_URL, settings)),
+    "primary", settings,
 )
 
-# SessionLocal factory for SQLAlchemy
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# asyncio drivers for the same databases (SQLAlchemy 1.4 asyncio extension)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url):
+    """Point DATABASE_URL at the asyncio driver for its backend."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for '{backend}' databases")
+    query = dict(url.query)
+    # asyncpg takes `ssl` rather than libpq's `sslmode`
+    if backend == "postgresql" and "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername=ASYNC_DRIVERS[backend], query=query)
+
+
+# Async engine with its own pool: async handlers wait on a connection here
+# instead of on a slot in anyio's worker threadpool
+async_engine = instrument(
+    create_async_engine(
+        async_database_url(engine_url(DATABASE_URL)),
+        poolclass=InstrumentedAsyncQueuePool,
+        **engine_options(DATABASE_URL, settings),
+    ),
+    "primary_async", settings,
+)
+
+# Optional read replica; the same pool sizing applies to the replica server
+replica_engine = replica_async_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = instrument(
+        create_engine(
+            engine_url(settings.DATABASE_REPLICA_URL),
+            poolclass=InstrumentedQueuePool,
+            **engine_options(settings.DATABASE_REPLICA_URL, settings),
+        ),
+        "replica", settings,
+    )
+    replica_async_engine = instrument(
+        create_async_engine(
+            async_database_url(engine_url(settings.DATABASE_REPLICA_URL)),
+            poolclass=InstrumentedAsyncQueuePool,
+            **engine_options(settings.DATABASE_REPLICA_URL, settings),
+        ),
+        "replica_async", settings,
+    )
+
+replica_health = ReplicaHealth(settings.DB_REPLICA_RETRY_SECONDS)
+
+for _engine in (engine, async_engine, replica_engine, replica_async_engine):
+    if _engine is not None:
+        configure_engine(_engine)
+
+if settings.SQL_INSTRUMENTATION:
+    for _engine in (engine, async_engine, replica_engine, replica_async_engine):
+        if _engine is not None:
+            track_queries(_engine)
+
+# Commit listeners (response cache invalidation) learn which tables each commit wrote
+track_writes()
+
+# SessionLocal factory for SQLAlchemy; reads may be routed to the replica (app/db/routing.py)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=routing_session_class(engine, replica_engine, replica_health),
+)
+
+AsyncSessionLocal = sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=routing_session_class(
+        async_engine.sync_engine,
+        replica_async_engine.sync_engine if replica_async_engine is not None else None,
+        replica_health,
+    ),
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Create the Base class for ORM models
 Base = declarative_base()
 
+@contextmanager
+def with_session():
+    """A short-lived session for scoped sync work: scripts, worker threads, run_sync callers.
+
+    Commits on success and rolls back on error; the connection goes back to
+    the pool on exit.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def with_async_session():
+    """A short-lived async session for work outside a request handler.
+
+    Commits on success and rolls back on error; the connection goes back to
+    the pool on exit.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
 # Dependency function to get a DB session
 def get_db():
     db = SessionLocal()
@@ -50,3 +171,14 @@ def get_db():
         raise
     finally:
         db.close()
+
+
+# Dependency function to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
@@ -0,0 +1,108 @@
+# app/middleware/conditional_get.py
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.crud.table_version import read_versions
+from app.db.session import with_async_session
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Weak comparison of an If-None-Match header against `etag` (RFC 9110 13.1.2)."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def not_modified(request_headers: Headers, response_headers: Headers) -> bool:
+    """Whether a client holding the conditional headers already has this response."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present
+        return etag_matches(if_none_match, response_headers.get("etag"))
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified_headers(headers: Headers) -> List[Tuple[bytes, bytes]]:
+    # A 304 repeats the validators and caching headers, and carries no body
+    keep = ("etag", "last-modified", "cache-control", "vary", "expires")
+    return [(name.encode(), value.encode()) for name, value in headers.items() if name in keep]
+
+
+def _validators(tags: Tuple[str, ...], versions: Dict[str, Tuple[int, datetime]]) -> Tuple[str, Optional[str]]:
+    stamp = "|".join(f"{tag}:{versions.get(tag, (0, None))[0]}" for tag in tags)
+    etag = f'W/"{hashlib.sha1(stamp.encode()).hexdigest()[:20]}"'
+    modified = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+    last_modified = None
+    if modified:
+        last_modified = format_datetime(max(modified).replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+    return etag, last_modified
+
+
+class ConditionalGetMiddleware:
+    """ETag / Last-Modified validators and 304 responses for versioned catalog routes.
+
+    `routes` maps a path prefix to the tables its responses are built from
+    (the same map as ResponseCacheMiddleware). The validators come from the
+    tables' rows in table_versions, read with one primary-key lookup before the
+    handler runs; a client that already has that version gets a 304 without
+    the handler querying or serializing anything.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Dict[str, Tuple[str, ...]]):
+        self.app = app
+        self.routes = routes
+
+    def _tags_for(self, path: str) -> Optional[Tuple[str, ...]]:
+        for prefix, tags in self.routes.items():
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return tags
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tags = self._tags_for(scope["path"]) if scope["type"] == "http" and scope["method"] == "GET" else None
+        if tags is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Read before rendering: a write landing in between can only make the
+        # body newer than its ETag, which costs a 200 later, never a wrong 304
+        async with with_async_session() as db:
+            versions = await db.run_sync(read_versions, tags)
+        etag, last_modified = _validators(tags, versions)
+
+        validators = Headers(raw=[(b"etag", etag.encode())] + (
+            [(b"last-modified", last_modified.encode())] if last_modified else []
+        ))
+        if not_modified(Headers(scope=scope), validators):
+            await send({"type": "http.response.start", "status": 304, "headers": validators.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["etag"] = etag
+                if last_modified:
+                    headers["last-modified"] = last_modified
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
@@ -0,0 +1,48 @@
+# app/middleware/db_routing.py
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.routing import allow_replica_reads, reset_replica_reads
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+WROTE_COOKIE = "db_wrote"
+
+
+class ReadReplicaMiddleware:
+    """Let read-only requests use the read replica, except right after the client wrote.
+
+    A successful write request sets a short-lived cookie; while it is present the
+    client's GETs stay on the primary, so replication lag never hides its own
+    writes. Everything else (writes, websockets, background jobs) uses the primary.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int = 5):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in READ_METHODS:
+            cookies = SimpleCookie(Headers(scope=scope).get("cookie", ""))
+            token = allow_replica_reads(WROTE_COOKIE not in cookies)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                reset_replica_reads(token)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{WROTE_COOKIE}=1; Max-Age={self.window_seconds}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
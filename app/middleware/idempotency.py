@@ -0,0 +1,147 @@
+# app/middleware/idempotency.py
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable
+
+import anyio
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.crud.idempotency import claim_key, purge_expired_keys, release_key, store_response
+from app.db.session import with_async_session
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyMiddleware:
+    """Run each `Idempotency-Key` at most once on the listed POST endpoints.
+
+    The first request claims the key and its response (anything below 500) is
+    stored for `ttl_seconds`; retries with the same key and body get that
+    response back with `Idempotent-Replayed: true`. A duplicate that arrives
+    while the first is still running gets 409, and reusing a key with a
+    different body is a 422. Requests without the header are not affected.
+
+    Keys are scoped to the caller's Authorization header, so two clients
+    sending the same key never see each other's responses. A claim whose
+    request never finishes (worker killed, task cancelled) lapses after
+    `lease_seconds` and the next retry runs the request again.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str],
+        ttl_seconds: int = 24 * 60 * 60,
+        lease_seconds: int = 60,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        client_key = headers.get(IDEMPOTENCY_HEADER)
+        if client_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not client_key or len(client_key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"}, status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        caller = headers.get("authorization", "")
+        key = hashlib.sha256(f"{scope['method']} {scope['path']} {caller} {client_key}".encode()).hexdigest()
+        request_hash = hashlib.sha256(body).hexdigest()
+        lease_until = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+        async with with_async_session() as db:
+            existing = await db.run_sync(claim_key, key, request_hash, lease_until)
+        if existing is not None:
+            await _replay(existing, request_hash)(scope, receive, send)
+            return
+
+        replayed_body = False
+
+        async def receive_body() -> Message:
+            nonlocal replayed_body
+            if not replayed_body:
+                replayed_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        content_type = None
+        chunks = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message["headers"]).get("content-type")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        finally:
+            async with with_async_session() as db:
+                if status_code < 500:
+                    await db.run_sync(
+                        store_response, key, lease_until, self.ttl_seconds, status_code, content_type, b"".join(chunks)
+                    )
+                else:
+                    await db.run_sync(release_key, key, lease_until)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _replay(existing, request_hash: str) -> Response:
+    if existing.request_hash != request_hash:
+        return JSONResponse(
+            {"detail": "Idempotency-Key was already used with a different request"}, status_code=422
+        )
+    if existing.status_code is None:
+        return JSONResponse(
+            {"detail": "A request with this Idempotency-Key is still in progress"},
+            status_code=409,
+            headers={"Retry-After": "1"},
+        )
+    response = Response(existing.body, status_code=existing.status_code, media_type=existing.content_type)
+    response.headers["idempotent-replayed"] = "true"
+    return response
+
+
+async def run_idempotency_purge(ttl_seconds: int) -> None:
+    """Background loop started from main.py; deletes expired keys about 24 times per TTL."""
+    interval = max(ttl_seconds // 24, 60)
+    while True:
+        await anyio.sleep(interval)
+        try:
+            async with with_async_session() as db:
+                purged = await db.run_sync(purge_expired_keys)
+            if purged:
+                logger.info(f"Purged {purged} expired idempotency keys")
+        except Exception as e:
+            logger.error(f"Idempotency key purge failed: {e}")
@@ -0,0 +1,49 @@
+# app/middleware/query_stats.py
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import QueryStats, end_request_stats, start_request_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Record query count, DB time and repeated statement shapes for each HTTP request.
+
+    The totals are returned in `Server-Timing` and `X-DB-Queries` headers. Any
+    statement shape that runs more than `repeat_threshold` times is logged as a
+    likely N+1; with `raise_on_repeat` (never in production) the offending
+    query raises RepeatedQueryError instead.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 10, raise_on_repeat: bool = False):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.raise_on_repeat = raise_on_repeat
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(self.repeat_threshold, self.raise_on_repeat)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("server-timing", f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"')
+                headers["x-db-queries"] = str(stats.count)
+            await send(message)
+
+        token = start_request_stats(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request_stats(token)
+            for shape, count in stats.repeated():
+                logger.warning(
+                    f"{scope['method']} {scope['path']} ran one statement {count} times "
+                    f"({stats.count} queries, {stats.duration * 1000:.1f}ms total): {shape}"
+                )
@@ -0,0 +1,97 @@
+# app/middleware/response_cache.py
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.routing import allow_replica_reads, reset_replica_reads
+from app.middleware.conditional_get import not_modified, not_modified_headers
+from app.services.response_cache import CachedResponse, ResponseCache
+
+CACHE_HEADER = "x-cache"
+
+
+class ResponseCacheMiddleware:
+    """Serve repeated GETs of public catalog routes from ResponseCache.
+
+    `routes` maps a path prefix to the tables its responses are built from.
+    Only 200 responses to anonymous requests (no Authorization header) are
+    stored, keyed by path and sorted query string; concurrent misses for one
+    key wait for a single render. Entries are dropped when a commit writes to
+    one of their tables (see app/db/changes.py) or when the TTL runs out.
+    Renders that may be stored read from the primary, never the replica: a
+    miss usually follows a write, and a lagging replica's body would stay
+    cached for the whole TTL.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Dict[str, Tuple[str, ...]], cache: ResponseCache):
+        self.app = app
+        self.routes = routes
+        self.cache = cache
+
+    def _tags_for(self, path: str) -> Optional[Tuple[str, ...]]:
+        for prefix, tags in self.routes.items():
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return tags
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or not self.cache.enabled:
+            await self.app(scope, receive, send)
+            return
+        tags = self._tags_for(scope["path"])
+        if tags is None or "authorization" in Headers(scope=scope):
+            await self.app(scope, receive, send)
+            return
+
+        query = "&".join(sorted(scope["query_string"].decode("latin-1").split("&")))
+        key = f"{scope['path']}?{query}"
+
+        entry, stamp = await self.cache.lookup(key, tags)
+        if entry is None and await self.cache.wait_for_fill(key):
+            entry, stamp = await self.cache.lookup(key, tags)
+            owner = False
+        else:
+            owner = entry is None
+        if entry is not None:
+            await _send_cached(entry, Headers(scope=scope), send)
+            return
+
+        start: Optional[Message] = None
+        chunks = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                MutableHeaders(scope=message)[CACHE_HEADER] = "MISS"
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        token = allow_replica_reads(False)
+        try:
+            await self.app(scope, receive, capture)
+            if start is not None and start["status"] == 200:
+                headers = [(name, value) for name, value in start["headers"] if name.lower() != CACHE_HEADER.encode()]
+                # Responses that set cookies are per-client
+                if not any(name.lower() == b"set-cookie" for name, _ in headers):
+                    await self.cache.store(key, 200, headers, b"".join(chunks), tags, stamp)
+        finally:
+            reset_replica_reads(token)
+            if owner:
+                self.cache.filled(key)
+
+
+async def _send_cached(entry: CachedResponse, request_headers: Headers, send: Send) -> None:
+    stored = Headers(raw=entry.headers)
+    if not_modified(request_headers, stored):
+        await send({"type": "http.response.start", "status": 304, "headers": not_modified_headers(stored)})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    await send({
+        "type": "http.response.start",
+        "status": entry.status,
+        "headers": entry.headers + [(CACHE_HEADER.encode(), b"HIT")],
+    })
+    await send({"type": "http.response.body", "body": entry.body})
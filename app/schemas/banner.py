@@ -1,6 +1,7 @@
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict
+from app.schemas.media import ImageMeta
 
 
 class BannerBase(BaseModel):
@@ -19,6 +20,8 @@ class BannerUpdate(BannerBase):
 class BannerOut(BannerBase):
     id: int
     image_url: Optional[str] = None  # Only here for response
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
 
     class Config:
         orm_mode = True
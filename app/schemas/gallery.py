@@ -1,14 +1,17 @@
 
 # schemas/gallery.py
 from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from typing import Optional, Dict
 from datetime import datetime
+from app.schemas.media import ImageMeta
 
 class GalleryBase(BaseModel):
     title: str
     description: str
     category: str
     image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
     created_at: Optional[datetime] = None
 
 class GalleryCreate(GalleryBase):
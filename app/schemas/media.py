@@ -0,0 +1,9 @@
+# app/schemas/media.py
+from pydantic import BaseModel
+
+class ImageMeta(BaseModel):
+    width: int
+    height: int
+    bytes: int
+    dominant_color: str  # "#rrggbb"
+    placeholder: str  # tiny WebP as a data: URI
@@ -1,8 +1,9 @@
 
 # app/schemas/news.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict
 from datetime import datetime
+from app.schemas.media import ImageMeta
 
 class NewsBase(BaseModel):
     title: str
@@ -10,6 +11,8 @@ class NewsBase(BaseModel):
     category: str
     content: str
     image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
 
 class NewsCreate(NewsBase):
     pass
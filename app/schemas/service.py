@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
+from app.schemas.media import ImageMeta
 
 
 # Base Service schema
@@ -25,6 +26,8 @@ class SubServiceOut(BaseModel):
     name: str
     description: str
     image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
 
     class Config:
         orm_mode = True
@@ -34,6 +37,8 @@ class SubServiceOut(BaseModel):
 class ServiceOut(ServiceBase):
     id: int
     image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
     sub_services: List[SubServiceOut] = []  # List of sub-service objects
 
     class Config:
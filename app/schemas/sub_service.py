@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict
+from app.schemas.media import ImageMeta
 
 class SubServiceCreate(BaseModel):
     name: str
@@ -18,6 +19,8 @@ class SubServiceResponse(BaseModel):
     description: Optional[str] = None
     price: float
     image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
     service_id: int
 
     class Config:
@@ -40,6 +43,8 @@ class SubServiceOut(BaseModel):
     description: Optional[str] = None
     price: float
     image_url: Optional[str] = None  # <-- Make this Optional too
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
 
     class Config:
         orm_mode = True
@@ -1,7 +1,8 @@
 
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict
+from app.schemas.media import ImageMeta
 
 
 class TeamsBase(BaseModel):
@@ -20,6 +21,8 @@ class TeamsUpdate(TeamsBase):
 class TeamsOut(TeamsBase):
     id: int
     image_url: Optional[str] = None  # Only here for response
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
 
     class Config:
         orm_mode = True
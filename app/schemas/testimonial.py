@@ -1,6 +1,7 @@
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict
+from app.schemas.media import ImageMeta
 
 class TestimonialBase(BaseModel):
     name: str
@@ -18,6 +19,8 @@ class TestimonialUpdate(TestimonialBase):
 class TestimonialOut(TestimonialBase):
     id: int
     image_url: Optional[str] = None  # Only here for response
+    image_variants: Optional[Dict[str, str]] = None
+    image_meta: Optional[ImageMeta] = None
 
     class Config:
         orm_mode = True
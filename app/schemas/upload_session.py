@@ -0,0 +1,26 @@
+# app/schemas/upload_session.py
+from pydantic import BaseModel, conint
+from typing import List
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    content_type: str
+    size: conint(gt=0)
+
+class UploadSessionOut(BaseModel):
+    upload_id: str
+    filename: str
+    content_type: str
+    size: int
+    chunk_size: int
+    total_chunks: int
+    received: List[int]
+    missing: List[int]
+    complete: bool
+    expires_at: float
+
+class UploadChunkOut(BaseModel):
+    upload_id: str
+    index: int
+    offset: int
+    size: int
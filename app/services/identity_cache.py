@@ -0,0 +1,171 @@
+# app/services/identity_cache.py
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.model.user import User
+
+# Columns an Identity is built from, plus the ones that decide whether the account may sign in
+AUTH_COLUMNS = frozenset({"email", "role", "hashed_password", "is_active"})
+# session.info key: ids of users whose identity changed, or ALL_USERS when they can't be named
+CHANGED_USERS = "changed_users"
+ALL_USERS = None
+
+
+class Identity(NamedTuple):
+    """What authorization checks need to know about a user, as currently stored."""
+    email: str
+    role: Optional[str]
+
+
+class IdentityCache:
+    """Small TTL/LRU map of user id -> Identity, so token checks skip the user table.
+
+    Users that don't exist are cached too (as None), so a deleted user's
+    tokens don't query on every request. A commit that creates or deletes a
+    user, or changes one of AUTH_COLUMNS, drops that user's entry in this
+    worker (see track_user_changes); other workers pick the change up once
+    their entries expire after `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Optional[Identity], float]]" = OrderedDict()
+        self._generation = 0
+        # Sync routes resolve and commit from worker threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def resolve(self, user_id: int, load: Callable[[int], Optional[Identity]]) -> Optional[Identity]:
+        """The identity of `user_id`, calling `load(user_id)` on a miss. None if there is no such user."""
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is not None and cached[1] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+            generation = self._generation
+
+        identity = load(user_id)
+        if not self.enabled:
+            return identity
+
+        with self._lock:
+            # A user change committed while loading: this row may already be stale
+            if generation == self._generation:
+                self._entries[user_id] = (identity, time.monotonic() + self.ttl_seconds)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return identity
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def discard(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+identity_cache = IdentityCache(settings.IDENTITY_CACHE_TTL_SECONDS, settings.IDENTITY_CACHE_MAX_ENTRIES)
+
+
+def _changed(session: Session) -> Optional[Set[int]]:
+    return session.info.setdefault(CHANGED_USERS, set())
+
+
+def _after_flush(session, flush_context):
+    changed = _changed(session)
+    if changed is ALL_USERS:
+        return
+    for obj in session.new:
+        # A cached "no such user" may be for an id the database hands out again
+        if isinstance(obj, User):
+            changed.add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            attrs = inspect(obj).attrs
+            if any(attrs[column].history.has_changes() for column in AUTH_COLUMNS):
+                changed.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+
+def _updated_columns(statement) -> Optional[Set[str]]:
+    """Columns an UPDATE may set, or None when its compiled form can't tell.
+
+    Expression values (x = x + 1) are listed in `postfetch`; literal values
+    are bound under the column's own key. Anonymous binds come from the WHERE
+    clause or inside expressions; a named bindparam() could be setting anything.
+    """
+    compiled = statement.compile()
+    columns = {column.key for column in compiled.postfetch}
+    for key, bind in compiled.binds.items():
+        if key in statement.table.c:
+            columns.add(key)
+        elif not bind.unique:
+            return None
+    return columns
+
+
+def _do_orm_execute(state):
+    # Bulk and Core DML through Session.execute() can't say which users it hit
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table = getattr(state.statement, "table", None)
+    if table is None or table.name != User.__tablename__:
+        return
+    if state.is_update:
+        columns = _updated_columns(state.statement)
+        if columns is not None and not columns & AUTH_COLUMNS:
+            # e.g. apply_booking_points crediting loyalty_points
+            return
+    state.session.info[CHANGED_USERS] = ALL_USERS
+
+
+def _after_commit(session):
+    if CHANGED_USERS not in session.info:
+        return
+    changed = session.info.pop(CHANGED_USERS)
+    if changed is ALL_USERS:
+        identity_cache.clear()
+    elif changed:
+        identity_cache.discard(changed)
+
+
+def track_user_changes() -> None:
+    """Drop cached identities as commits create, delete or re-role users.
+
+    Like track_writes(), changes from a rolled-back transaction stay recorded
+    until the session's next commit, so entries are only ever dropped early.
+    """
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
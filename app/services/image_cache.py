@@ -0,0 +1,115 @@
+# app/services/image_cache.py
+import os
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict
+
+import anyio
+
+from app.core.config import settings
+from app.services.images import render_resized, run_in_image_pool
+
+logger = logging.getLogger(__name__)
+
+# Requested widths are rounded up to one of these so the cache key space stays bounded
+CACHE_WIDTHS = (64, 128, 160, 240, 320, 480, 640, 768, 960, 1280, 1600, 1920)
+CACHE_FORMATS = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+
+_io_limiter = anyio.CapacityLimiter(4)
+
+
+def snap_width(width: int) -> int:
+    for allowed in CACHE_WIDTHS:
+        if width <= allowed:
+            return allowed
+    return CACHE_WIDTHS[-1]
+
+
+class ResizeCache:
+    """Disk cache of resized images with least-recently-used eviction under a byte cap.
+
+    Every worker shares the directory, so the directory is the index: a hit
+    bumps the file's mtime, and after each render the directory is rescanned
+    and the least recently used files are removed until the total fits under
+    `max_bytes` again. Concurrent misses for one key in a worker share a
+    single render.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._pending: Dict[str, asyncio.Event] = {}
+
+    @staticmethod
+    def key_for(source: Path, width: int, fmt: str) -> str:
+        stat_result = source.stat()
+        raw = f"{source.parent.name}/{source.name}:{stat_result.st_mtime_ns}:{stat_result.st_size}:{width}"
+        return f"{hashlib.sha1(raw.encode()).hexdigest()}.{fmt}"
+
+    def _touch(self, path: Path) -> bool:
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                try:
+                    stat_result = entry.stat()
+                except FileNotFoundError:  # evicted by another worker mid-scan
+                    continue
+                entries.append((stat_result.st_mtime, entry.name, stat_result.st_size))
+                total += stat_result.st_size
+        # Never evict `keep`: it is about to be served
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                (self.directory / name).unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    async def get(self, source: Path, width: int, fmt: str) -> Path:
+        """Return the cached resize of `source`, rendering it on first request."""
+        key = await anyio.to_thread.run_sync(self.key_for, source, width, fmt, limiter=_io_limiter)
+        target = self.directory / key
+        if await anyio.to_thread.run_sync(self._touch, target, limiter=_io_limiter):
+            return target
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            await pending.wait()
+            return await self.get(source, width, fmt)
+
+        done = self._pending[key] = asyncio.Event()
+        try:
+            await anyio.to_thread.run_sync(
+                lambda: self.directory.mkdir(parents=True, exist_ok=True), limiter=_io_limiter
+            )
+            await run_in_image_pool(render_resized, str(source), str(target), width, fmt)
+            await anyio.to_thread.run_sync(self._evict, key, limiter=_io_limiter)
+        finally:
+            del self._pending[key]
+            done.set()
+        return target
+
+
+resize_cache = ResizeCache(
+    Path(settings.MEDIA_CACHE_DIR) if settings.MEDIA_CACHE_DIR else Path(__file__).resolve().parents[2] / ".media_cache",
+    settings.MEDIA_CACHE_MAX_BYTES,
+)
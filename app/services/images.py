@@ -0,0 +1,158 @@
+# app/services/images.py
+import io
+import os
+import base64
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services.uploads import UPLOAD_ROOT
+from app.utils.processes import new_process_pool
+
+logger = logging.getLogger(__name__)
+
+# Derivatives produced for every stored image: name -> max width in pixels
+VARIANT_WIDTHS = {
+    "thumb": 320,
+    "medium": 960,
+}
+VARIANT_FORMAT = "webp"
+VARIANT_QUALITY = 80
+
+# Inline placeholder shown before the real bytes arrive (a few hundred bytes as a data URI)
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def variant_filename(stem: str, width: int, fmt: str = VARIANT_FORMAT) -> str:
+    return f"{stem}_{width}w.{fmt}"
+
+
+def _url_to_path(image_url: str) -> Path:
+    # image_url is always "/uploads/<category>/<file>"
+    return UPLOAD_ROOT.joinpath(*image_url.split("/")[2:])
+
+
+def _dominant_color(image) -> str:
+    from PIL import Image
+
+    sample = image.convert("RGB")
+    sample.thumbnail((64, 64), Image.BILINEAR)
+    quantized = sample.quantize(colors=8)
+    palette = quantized.getpalette()
+    _, index = max(quantized.getcolors())
+    red, green, blue = palette[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _placeholder(image) -> str:
+    from PIL import Image
+
+    tiny = image.copy()
+    tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BILINEAR)
+    buffer = io.BytesIO()
+    tiny.save(buffer, format=VARIANT_FORMAT, quality=PLACEHOLDER_QUALITY)
+    return f"data:image/{VARIANT_FORMAT};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def _save_atomic(image, target: Path, **params) -> None:
+    # A unique temp name per render: another worker may be writing the same target
+    part = target.with_name(f".{uuid4().hex}.part")
+    try:
+        image.save(part, **params)
+        os.replace(part, target)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+
+
+def render_variants(source: str, widths: Dict[str, int]) -> Tuple[Dict[str, str], Dict]:
+    """Write WebP variants of `source` next to it and describe the image. Runs in a worker process.
+
+    Returns the variant filenames by name and the metadata the listings need for
+    first paint: displayed width/height, byte size, dominant color and a tiny
+    inline placeholder.
+    """
+    from PIL import Image, ImageOps
+
+    source_path = Path(source)
+    written = {}
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        meta = {
+            "width": image.width,
+            "height": image.height,
+            "bytes": source_path.stat().st_size,
+            "dominant_color": _dominant_color(image),
+            "placeholder": _placeholder(image),
+        }
+        for name, width in widths.items():
+            filename = variant_filename(source_path.stem, width)
+            target = source_path.with_name(filename)
+            if target.exists():
+                # Reused by a deduplicated upload; restart its GC grace period
+                os.utime(target)
+            else:
+                resized = image.copy()
+                resized.thumbnail((width, width * 4), Image.LANCZOS)
+                _save_atomic(resized, target, format=VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+            written[name] = filename
+    return written, meta
+
+
+def render_resized(source: str, target: str, width: int, fmt: str) -> int:
+    """Write one resized copy of `source` to `target` and return its size. Runs in a worker process."""
+    from PIL import Image, ImageOps
+
+    target_path = Path(target)
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = "A" in image.getbands() and fmt != "jpeg"
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        image.thumbnail((width, width * 4), Image.LANCZOS)
+        _save_atomic(image, target_path, format=fmt, quality=VARIANT_QUALITY)
+    return target_path.stat().st_size
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = new_process_pool(settings.IMAGE_WORKERS)
+    return _pool
+
+
+async def run_in_image_pool(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), fn, *args)
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def process_image(image_url: str) -> Tuple[Dict[str, str], Optional[Dict]]:
+    """Build the VARIANT_WIDTHS derivatives for a stored image and extract its metadata.
+
+    Returns the variant URLs by name and the image metadata (see render_variants).
+    Encoding runs in a process pool so it never holds the event loop or the GIL.
+    A failure is logged and yields no variants and no metadata; the original is
+    still served.
+    """
+    source = _url_to_path(image_url)
+    try:
+        written, meta = await run_in_image_pool(render_variants, str(source), VARIANT_WIDTHS)
+    except Exception as e:
+        logger.warning(f"Could not process image {image_url}: {e}")
+        return {}, None
+    base = image_url.rsplit("/", 1)[0]
+    return {name: f"{base}/{filename}" for name, filename in written.items()}, meta
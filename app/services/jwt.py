@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 # import jwt
 from jose import jwt , JWTError
 from fastapi import Depends, HTTPException, status
@@ -9,7 +9,8 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.db.session import get_db
 from app.db.model.user import User
-from app.crud.user import get_user_by_email
+from app.crud.user import get_user_by_email, get_user_identity
+from app.services.identity_cache import Identity, identity_cache
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
@@ -30,18 +31,59 @@ def decode_access_token(token: str):
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         return None
-    except jwt.PyJWTError:
+    except JWTError:
         return None
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+class Principal(NamedTuple):
+    """The caller behind a token, for routes that only need to know who they are and their role."""
+    id: int
+    email: str
+    role: Optional[str]
+
+
+def _token_claims(token: str) -> dict:
     payload = decode_access_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
-
-    email = payload.get("sub")
-    if not email:
+    if not payload.get("sub"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token payload invalid")
+    return payload
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    """Authenticate from the token's claims, checked against the identity cache.
+
+    No query runs on a cache hit, so no connection is checked out; a miss is
+    one lookup of the user's email and role by primary key. The role comes from
+    the stored user rather than the token, so role changes and deletions apply
+    without waiting for the token to expire.
+    """
+    payload = _token_claims(token)
+    email, user_id = payload["sub"], payload.get("id")
+    if user_id is None:
+        # Tokens issued before the id claim
+        user = get_user_by_email(db, email=email)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return Principal(user.id, user.email, user.role)
+
+    def load(user_id: int) -> Optional[Identity]:
+        row = get_user_identity(db, user_id)
+        return Identity(row.email, row.role) if row else None
+
+    identity = identity_cache.resolve(user_id, load)
+    if identity is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if identity.email != email:
+        # The account's email changed after this token was issued
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    return Principal(user_id, identity.email, identity.role)
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """The full User row behind the token; prefer get_current_principal when id and role are enough."""
+    email = _token_claims(token)["sub"]
 
     user = get_user_by_email(db, email=email)
     if not user:
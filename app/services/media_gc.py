@@ -0,0 +1,225 @@
+# app/services/media_gc.py
+import time
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import anyio
+from sqlalchemy import or_, union
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import with_session
+from app.db.model.banner import BannerModel
+from app.db.model.gallery import GalleryModel
+from app.db.model.media import MediaBlob
+from app.db.model.news import NewsModel
+from app.db.model.pastevent import PastEventModel
+from app.db.model.service import ServiceModel
+from app.db.model.sub_service import SubService
+from app.db.model.teams import TeamsModel
+from app.db.model.testimonial import TestimonialModel
+from app.db.model.user import User
+from app.services.uploads import MEDIA_CATEGORY, UPLOAD_ROOT
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: every worker may sweep
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Columns that can point at a file under uploads/. Only files stored before the
+# content-addressed media store are matched against them; blobs under
+# uploads/media/ are judged by MediaBlob.ref_count.
+MEDIA_COLUMNS = (
+    GalleryModel.image_url,
+    NewsModel.image_url,
+    BannerModel.image_url,
+    PastEventModel.image_url,
+    TeamsModel.image_url,
+    TestimonialModel.image_url,
+    ServiceModel.image_url,
+    SubService.image_url,
+    User.profile_image,
+)
+
+# One token: the sweeper runs a single disk/DB job at a time so it never crowds out live I/O
+_gc_limiter = anyio.CapacityLimiter(1)
+
+
+def referenced_urls(db: Session, urls: Iterable[str] = None) -> Set[str]:
+    """Return the upload URLs still stored in any media column (optionally only among `urls`)."""
+    selects = []
+    for column in MEDIA_COLUMNS:
+        query = db.query(column.label("url")).filter(column.isnot(None))
+        if urls is not None:
+            query = query.filter(column.in_(list(urls)))
+        selects.append(query.statement)
+    return {row.url for row in db.execute(union(*selects))}
+
+
+def live_blobs(db: Session, grace_seconds: int, keys: Iterable[str] = None, lock: bool = False) -> Set[str]:
+    """SHA-256 keys of blobs that are referenced, or were released less than `grace_seconds` ago.
+
+    A blob with no row at all is not live: its upload never committed.
+    """
+    query = db.query(MediaBlob.sha256).filter(or_(
+        MediaBlob.ref_count > 0,
+        MediaBlob.updated_at > datetime.utcnow() - timedelta(seconds=grace_seconds),
+    ))
+    if keys is not None:
+        query = query.filter(MediaBlob.sha256.in_(list(keys)))
+    if lock:
+        # An upload acquiring one of these blobs waits for the sweep to commit
+        query = query.with_for_update()
+    return {row.sha256 for row in query}
+
+
+def _upload_files() -> Iterable[Path]:
+    if not UPLOAD_ROOT.is_dir():
+        return
+    for category in UPLOAD_ROOT.iterdir():
+        if not category.is_dir() or category.name.startswith("."):
+            continue
+        for path in category.iterdir():
+            if path.is_file():
+                yield path
+
+
+def _url_for(path: Path) -> str:
+    return f"/uploads/{path.parent.name}/{path.name}"
+
+
+def _blob_key(path: Path) -> Optional[str]:
+    # <sha256><ext>, its derivatives (<sha256>_<width>w.webp) and precompressed
+    # siblings all belong to the blob row named by the leading hash
+    if path.parent.name != MEDIA_CATEGORY:
+        return None
+    return path.name.split(".", 1)[0].split("_", 1)[0]
+
+
+def find_orphans(db: Session, grace_seconds: int) -> List[Dict]:
+    """List files under uploads/ that nothing references and that are older than the grace period.
+
+    Files in the media store are orphans once their blob's ref_count is zero
+    (or they have no blob row); older per-category files once no media column
+    points at them. The grace period covers uploads whose rows have not been
+    committed yet and blobs that a concurrent upload has just deduplicated
+    against.
+    """
+    live = live_blobs(db, grace_seconds)
+    referenced = referenced_urls(db)
+    cutoff = time.time() - grace_seconds
+    orphans = []
+    for path in _upload_files():
+        key = _blob_key(path)
+        if key is not None:
+            in_use = key in live
+        else:
+            in_use = _url_for(path) in referenced
+        if in_use:
+            continue
+        stat_result = path.stat()
+        if stat_result.st_mtime > cutoff:
+            continue
+        orphans.append({"url": _url_for(path), "path": str(path), "size": stat_result.st_size, "blob": key})
+    return orphans
+
+
+def _reclaim_batch(batch: List[Dict], grace_seconds: int) -> List[Dict]:
+    with with_session() as db:
+        # Re-check right before deleting: an upload or edit may have reused the file since the scan
+        keys = {item["blob"] for item in batch if item["blob"] is not None}
+        live = live_blobs(db, grace_seconds, keys, lock=True) if keys else set()
+        still_used = referenced_urls(db, [item["url"] for item in batch if item["blob"] is None])
+        cutoff = time.time() - grace_seconds
+        reclaimed = []
+        for item in batch:
+            if item["blob"] in live or item["url"] in still_used:
+                continue
+            path = Path(item["path"])
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            reclaimed.append(item)
+
+        dead = {item["blob"] for item in reclaimed if item["blob"] is not None}
+        if dead:
+            db.query(MediaBlob)\
+                .filter(MediaBlob.sha256.in_(dead), MediaBlob.ref_count <= 0)\
+                .delete(synchronize_session=False)
+        return reclaimed
+
+
+def _scan(grace_seconds: int) -> List[Dict]:
+    with with_session() as db:
+        return find_orphans(db, grace_seconds)
+
+
+async def sweep_orphans(
+    dry_run: bool = True,
+    grace_seconds: int = None,
+    batch_size: int = None,
+    pause_seconds: float = None,
+) -> Dict:
+    """Find unreferenced uploads and, unless `dry_run`, delete them in rate-limited batches."""
+    grace_seconds = settings.MEDIA_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    batch_size = batch_size or settings.MEDIA_GC_BATCH_SIZE
+    pause_seconds = settings.MEDIA_GC_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+
+    orphans = await anyio.to_thread.run_sync(_scan, grace_seconds, limiter=_gc_limiter)
+    report = {
+        "dry_run": dry_run,
+        "orphans": len(orphans),
+        "orphan_bytes": sum(item["size"] for item in orphans),
+        "deleted": 0,
+        "deleted_bytes": 0,
+        "files": [item["url"] for item in orphans],
+    }
+    if dry_run:
+        return report
+
+    for start in range(0, len(orphans), batch_size):
+        if start:
+            await anyio.sleep(pause_seconds)
+        batch = orphans[start:start + batch_size]
+        reclaimed = await anyio.to_thread.run_sync(_reclaim_batch, batch, grace_seconds, limiter=_gc_limiter)
+        report["deleted"] += len(reclaimed)
+        report["deleted_bytes"] += sum(item["size"] for item in reclaimed)
+
+    logger.info(f"Media GC reclaimed {report['deleted']} files ({report['deleted_bytes']} bytes)")
+    return report
+
+
+def _try_lock():
+    """Take the sweeper lock so only one uvicorn worker sweeps at a time."""
+    UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
+    handle = open(UPLOAD_ROOT / ".gc.lock", "a")
+    if fcntl is None:
+        return handle
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+async def run_media_gc() -> None:
+    """Background loop started from main.py; sweeps every MEDIA_GC_INTERVAL_SECONDS."""
+    while True:
+        await anyio.sleep(settings.MEDIA_GC_INTERVAL_SECONDS)
+        lock = await anyio.to_thread.run_sync(_try_lock, limiter=_gc_limiter)
+        if lock is None:
+            continue
+        try:
+            await sweep_orphans(dry_run=False)
+        except Exception as e:
+            logger.error(f"Media GC sweep failed: {e}")
+        finally:
+            lock.close()
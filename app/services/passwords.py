@@ -0,0 +1,108 @@
+# app/services/passwords.py
+import math
+import time
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.core import security
+from app.core.config import settings
+from app.utils.processes import new_process_pool
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+# Calls submitted and not yet finished, running or waiting for a process
+_pending = 0
+_completed = 0
+_rejected = 0
+# Moving average of one call's wall time, seeded with a typical bcrypt cost
+_avg_seconds = 0.25
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = new_process_pool(settings.PASSWORD_HASH_WORKERS)
+    return _pool
+
+
+def shutdown_password_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _retry_after() -> int:
+    queued = max(0, _pending - settings.PASSWORD_HASH_WORKERS)
+    return max(1, math.ceil(_avg_seconds * (queued + 1) / settings.PASSWORD_HASH_WORKERS))
+
+
+def _run(fn, *args):
+    """Run a bcrypt call in the password pool and wait for it.
+
+    At most PASSWORD_HASH_WORKERS calls run at once and PASSWORD_HASH_MAX_QUEUE
+    more may wait; past that the request is turned away with a 503 straight
+    away, so a login burst holds a bounded number of threadpool threads (each
+    waiting, not computing) and everything else keeps being served.
+    """
+    global _pool, _pending, _completed, _rejected, _avg_seconds
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+
+    with _lock:
+        if _pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+            _rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(_retry_after())},
+            )
+        _pending += 1
+        pool = _get_pool()
+
+    started = time.monotonic()
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool for the next call
+        logger.error("Password hashing pool broke, restarting it")
+        with _lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server is busy, please retry shortly", headers={"Retry-After": "1"})
+    finally:
+        elapsed = time.monotonic() - started
+        with _lock:
+            _pending -= 1
+            _completed += 1
+            _avg_seconds = 0.9 * _avg_seconds + 0.1 * elapsed
+
+
+def get_password_hash(password: str) -> str:
+    return _run(security.get_password_hash, password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _run(security.verify_password, plain_password, hashed_password)
+
+
+def password_pool_metrics() -> Dict:
+    with _lock:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+            "running": min(_pending, settings.PASSWORD_HASH_WORKERS),
+            "queued": max(0, _pending - settings.PASSWORD_HASH_WORKERS),
+            "completed": _completed,
+            "rejected": _rejected,
+            "avg_ms": round(_avg_seconds * 1000, 1),
+        }
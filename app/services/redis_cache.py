@@ -0,0 +1,91 @@
+# app/services/redis_cache.py
+import json
+import hashlib
+import logging
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import anyio
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # only needed when REDIS_URL is set
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCacheBackend:
+    """Shared response store and invalidation bus for every worker, over the Redis protocol.
+
+    Each table tag has a version counter. Stored responses are keyed by the
+    versions of their tags when they were rendered, so bumping a tag makes
+    every older entry unreachable at once (they age out by TTL). Bumps are
+    also published on a channel so each worker can drop its local copies.
+    """
+
+    def __init__(self, client, prefix: str = "cache"):
+        self.client = client
+        self.prefix = prefix
+        self.channel = f"{prefix}:invalidate"
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "cache") -> "RedisCacheBackend":
+        if aioredis is None:
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed")
+        return cls(aioredis.from_url(url), prefix)
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.prefix}:version:{tag}"
+
+    def _entry_key(self, key: str, versions: Tuple[int, ...]) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return f"{self.prefix}:response:{digest}:{'.'.join(map(str, versions))}"
+
+    async def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        values = await self.client.mget([self._version_key(tag) for tag in tags])
+        return tuple(int(value or 0) for value in values)
+
+    async def get(self, key: str, versions: Tuple[int, ...]) -> Optional[bytes]:
+        return await self.client.get(self._entry_key(key, versions))
+
+    async def put(self, key: str, versions: Tuple[int, ...], payload: bytes, ttl_seconds: int) -> None:
+        await self.client.set(self._entry_key(key, versions), payload, ex=ttl_seconds)
+
+    async def bump(self, tags: Iterable[str], origin: str) -> None:
+        """Advance the tags' versions and tell every worker to drop entries tagged with them."""
+        tags = sorted(tags)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self._version_key(tag))
+            pipe.publish(self.channel, json.dumps({"origin": origin, "tags": tags}))
+            await pipe.execute()
+
+    async def listen(
+        self,
+        on_invalidate: Callable[[str, List[str]], None],
+        on_reconnect: Callable[[], None],
+    ) -> None:
+        """Deliver published invalidations until cancelled, reconnecting with backoff."""
+        delay = 0.5
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                # Invalidations may have been missed while disconnected
+                on_reconnect()
+                delay = 0.5
+                try:
+                    async for message in pubsub.listen():
+                        payload = json.loads(message["data"])
+                        on_invalidate(payload["origin"], payload["tags"])
+                finally:
+                    await pubsub.aclose()
+            except anyio.get_cancelled_exc_class():
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation channel lost, reconnecting in {delay}s: {e}")
+                await anyio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,240 @@
+# app/services/response_cache.py
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services.redis_cache import RedisCacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    tags: Tuple[str, ...]
+    expires_at: float
+
+    def dumps(self) -> bytes:
+        head = {"status": self.status, "headers": [[n.decode("latin-1"), v.decode("latin-1")] for n, v in self.headers]}
+        return json.dumps(head).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, payload: bytes, tags: Tuple[str, ...], expires_at: float) -> "CachedResponse":
+        head, body = payload.split(b"\n", 1)
+        head = json.loads(head)
+        headers = [(n.encode("latin-1"), v.encode("latin-1")) for n, v in head["headers"]]
+        return cls(head["status"], headers, body, tags, expires_at)
+
+
+class CacheStamp(NamedTuple):
+    """Tag versions read before rendering; a response is only stored if they still hold."""
+    generations: Tuple[int, ...]
+    versions: Optional[Tuple[int, ...]]
+
+
+class ResponseCache:
+    """In-memory LRU of rendered responses, tagged with the tables they were built from.
+
+    Entries expire after `ttl_seconds` and the least recently used are evicted
+    once the bodies exceed `max_bytes`. invalidate() drops every entry that
+    carries one of the given tags; each tag also has a generation counter so a
+    response rendered while its data changed is never stored.
+
+    With a RedisCacheBackend attached, local misses fall through to the shared
+    store and every commit's tables are broadcast, so the other workers drop
+    their copies within a round trip of the write.
+    """
+
+    def __init__(self, ttl_seconds: int, max_bytes: int, backend: Optional[RedisCacheBackend] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.origin = uuid4().hex
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._total = 0
+        self._generations: Dict[str, int] = {}
+        # invalidate() runs from worker threads when sync routes commit
+        self._lock = threading.Lock()
+        self._pending: Dict[str, asyncio.Event] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def generations(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    async def lookup(self, key: str, tags: Tuple[str, ...]) -> Tuple[Optional[CachedResponse], CacheStamp]:
+        """The cached response for `key`, local first, then shared; plus the stamp to store a fresh one."""
+        entry = self.get(key)
+        stamp = CacheStamp(self.generations(tags), None)
+        if entry is not None or self.backend is None:
+            if entry is None:
+                self.misses += 1
+            return entry, stamp
+        try:
+            versions = await self.backend.versions(tags)
+            payload = await self.backend.get(key, versions)
+        except Exception as e:
+            logger.warning(f"Shared response cache unavailable: {e}")
+            self.misses += 1
+            return None, stamp
+        stamp = stamp._replace(versions=versions)
+        if payload is None:
+            self.misses += 1
+            return None, stamp
+        entry = CachedResponse.loads(payload, tags, time.monotonic() + self.ttl_seconds)
+        self._put_local(key, entry, stamp.generations)
+        self.shared_hits += 1
+        return entry, stamp
+
+    async def store(self, key: str, status: int, headers, body: bytes, tags: Tuple[str, ...], stamp: CacheStamp) -> None:
+        if len(body) > self.max_bytes:
+            return
+        entry = CachedResponse(status, headers, body, tags, time.monotonic() + self.ttl_seconds)
+        if not self._put_local(key, entry, stamp.generations):
+            return
+        if self.backend is not None and stamp.versions is not None:
+            try:
+                await self.backend.put(key, stamp.versions, entry.dumps(), self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Could not store response in the shared cache: {e}")
+
+    def _put_local(self, key: str, entry: CachedResponse, generations: Tuple[int, ...]) -> bool:
+        with self._lock:
+            # Written to since the handler started reading: this body may already be stale
+            if tuple(self._generations.get(tag, 0) for tag in entry.tags) != generations:
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._total += len(entry.body)
+            while self._total > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+            return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags: Set[str] = set(tags)
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, entry in self._entries.items() if tags.intersection(entry.tags)]
+            for key in stale:
+                self._drop(key)
+        return len(stale)
+
+    def tables_written(self, tables: Set[str]) -> None:
+        """on_commit() listener: drop local entries now and broadcast to the other workers."""
+        self.invalidate(tables)
+        if self._loop is not None and self._outbox is not None:
+            self._loop.call_soon_threadsafe(self._outbox.put_nowait, set(tables))
+
+    def clear(self) -> None:
+        with self._lock:
+            # Bump every known tag too, so renders that are in flight aren't stored
+            for tag in self._generations:
+                self._generations[tag] += 1
+            self._entries.clear()
+            self._total = 0
+
+    def _drop(self, key: str) -> None:
+        self._total -= len(self._entries.pop(key).body)
+
+    def _on_remote_invalidate(self, origin: str, tags: List[str]) -> None:
+        if origin != self.origin:
+            self.invalidate(tags)
+
+    async def _publish(self) -> None:
+        while True:
+            tags = await self._outbox.get()
+            # Coalesce whatever else queued up while the last publish was in flight
+            while not self._outbox.empty():
+                tags |= self._outbox.get_nowait()
+            try:
+                await self.backend.bump(tags, self.origin)
+            except Exception as e:
+                logger.error(f"Could not publish cache invalidation for {sorted(tags)}: {e}")
+
+    async def start(self) -> None:
+        """Connect the invalidation bus; called once per worker at startup."""
+        if self.backend is None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._publish()),
+            asyncio.create_task(self.backend.listen(self._on_remote_invalidate, self.clear)),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._loop = None
+        if self.backend is not None:
+            await self.backend.close()
+
+    async def wait_for_fill(self, key: str) -> bool:
+        """Wait if another request is already rendering `key`. Returns True if it was."""
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = asyncio.Event()
+            return False
+        await pending.wait()
+        return True
+
+    def filled(self, key: str) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "shared": self.backend is not None,
+            }
+
+
+def _cache_ttl() -> int:
+    if settings.REDIS_URL or settings.worker_count <= 1:
+        return settings.RESPONSE_CACHE_TTL_SECONDS
+    # Other workers never hear about this worker's writes; bound how long they serve stale pages
+    return min(settings.RESPONSE_CACHE_TTL_SECONDS, settings.RESPONSE_CACHE_UNSHARED_TTL_SECONDS)
+
+
+response_cache = ResponseCache(
+    _cache_ttl(),
+    settings.RESPONSE_CACHE_MAX_BYTES,
+    RedisCacheBackend.from_url(settings.REDIS_URL) if settings.REDIS_URL else None,
+)
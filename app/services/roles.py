@@ -1,10 +1,8 @@
-
 # app/services/roles.py
 from fastapi import Depends, HTTPException, status
-from app.services.jwt import get_current_user
-from app.schemas.user import UserOut
+from app.services.jwt import Principal, get_current_principal
 
-def admin_required(current_user: UserOut = Depends(get_current_user)) -> UserOut:
+def admin_required(current_user: Principal = Depends(get_current_principal)) -> Principal:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
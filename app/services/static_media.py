@@ -0,0 +1,185 @@
+# app/services/static_media.py
+import os
+import re
+import stat
+from email.utils import formatdate
+from mimetypes import guess_type
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+# Content-addressed originals and their derivatives: <sha256>[_<width>w].<ext>
+HASHED_NAME = re.compile(r"^[0-9a-f]{64}(_\d+w)?\.[a-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=86400"
+
+# Precompressed siblings, in order of preference
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into an inclusive (start, end).
+
+    Returns None when the header should be ignored (malformed or multi-range,
+    which we answer with the full body) and raises ValueError when it cannot be
+    satisfied.
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+class MediaFileResponse(Response):
+    """File response with strong validators and single byte-range support.
+
+    The body (or the requested range) is streamed from disk in chunks off the
+    event loop.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        headers: dict,
+        media_type: Optional[str],
+        byte_range: Optional[Tuple[int, int]] = None,
+    ):
+        self.path = path
+        size = stat_result.st_size
+        if byte_range is None:
+            self.status_code = 200
+            self.offset, self.count = 0, size
+        else:
+            start, end = byte_range
+            self.status_code = 206
+            self.offset, self.count = start, end - start + 1
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+        headers["content-length"] = str(self.count)
+        headers["accept-ranges"] = "bytes"
+        headers.setdefault("last-modified", formatdate(stat_result.st_mtime, usegmt=True))
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if scope["method"].upper() == "HEAD" or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class MediaStaticFiles(StaticFiles):
+    """StaticFiles for /uploads with immutable caching of content-hashed files.
+
+    Adds strong ETags, Range/If-Range handling and precompressed `.br`/`.gz`
+    siblings on top of Starlette's conditional GET support. Dot-prefixed files
+    and directories (upload session chunks, the media GC lock) are never served.
+    """
+
+    def _lookup(self, path: str, accepted: set):
+        full_path, stat_result = self.lookup_path(path)
+        encoding = encoded_stat = None
+        has_siblings = False
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            for candidate, suffix in PRECOMPRESSED:
+                try:
+                    candidate_stat = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                has_siblings = True
+                if encoding is None and candidate in accepted:
+                    encoding, encoded_stat = candidate, candidate_stat
+        return full_path, stat_result, encoding, encoded_stat, has_siblings
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        if any(part.startswith(".") for part in re.split(r"[/\\]", path)):
+            raise HTTPException(status_code=404)
+
+        request_headers = Headers(scope=scope)
+        accepted = {
+            token.split(";")[0].strip().lower()
+            for token in request_headers.get("accept-encoding", "").split(",")
+        }
+        try:
+            full_path, stat_result, encoding, encoded_stat, has_siblings = await anyio.to_thread.run_sync(
+                self._lookup, path, accepted
+            )
+        except PermissionError:
+            raise HTTPException(status_code=401)
+
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            raise HTTPException(status_code=404)
+
+        name = os.path.basename(full_path)
+        media_type = guess_type(name)[0] or "application/octet-stream"
+        headers = {}
+        if HASHED_NAME.match(name):
+            etag_base = name.rsplit(".", 1)[0]
+            headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            etag_base = f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+            headers["cache-control"] = DEFAULT_CACHE_CONTROL
+
+        serve_path, serve_stat = full_path, stat_result
+        if encoding is not None:
+            serve_path, serve_stat = full_path + dict(PRECOMPRESSED)[encoding], encoded_stat
+            headers["content-encoding"] = encoding
+            etag_base = f"{etag_base}-{encoding}"
+        if has_siblings:
+            headers["vary"] = "Accept-Encoding"
+        headers["etag"] = f'"{etag_base}"'
+        headers["last-modified"] = formatdate(stat_result.st_mtime, usegmt=True)
+
+        if self.is_not_modified(Headers(headers), request_headers):
+            return NotModifiedResponse(Headers(headers))
+
+        byte_range = None
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and (if_range is None or if_range in (headers["etag"], headers["last-modified"])):
+            try:
+                byte_range = _parse_range(range_header, serve_stat.st_size)
+            except ValueError:
+                return Response(
+                    status_code=416,
+                    headers={"content-range": f"bytes */{serve_stat.st_size}", "accept-ranges": "bytes"},
+                )
+
+        return MediaFileResponse(serve_path, serve_stat, headers, media_type, byte_range)
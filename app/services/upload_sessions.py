@@ -0,0 +1,296 @@
+# app/services/upload_sessions.py
+import json
+import math
+import os
+import re
+import shutil
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from uuid import uuid4
+
+import anyio
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.media import release_media
+from app.services.images import process_image
+from app.services.uploads import IMAGE_TYPES, UPLOAD_ROOT, save_image, store_sources
+
+logger = logging.getLogger(__name__)
+
+# One directory per session: session.json plus <index>.chunk files. Dot-prefixed,
+# so the media GC skips it and the /uploads mount answers 404 for it.
+SESSION_ROOT = UPLOAD_ROOT / ".sessions"
+SESSION_ID = re.compile(r"^[0-9a-f]{32}$")
+META_FILE = "session.json"
+
+_chunk_limiter = anyio.CapacityLimiter(8)
+# Counting a client's open sessions and creating one happen together
+_create_lock = threading.Lock()
+
+
+def _session_dir(upload_id: str) -> Path:
+    if not SESSION_ID.match(upload_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    return SESSION_ROOT / upload_id
+
+
+def _total_chunks(meta: Dict) -> int:
+    return math.ceil(meta["size"] / meta["chunk_size"])
+
+
+def _chunk_length(meta: Dict, index: int) -> int:
+    return min(meta["chunk_size"], meta["size"] - index * meta["chunk_size"])
+
+
+def _expired(meta: Dict) -> bool:
+    return meta["created_at"] + settings.UPLOAD_SESSION_TTL_SECONDS < time.time()
+
+
+def _read_meta(directory: Path) -> Optional[Dict]:
+    try:
+        with open(directory / META_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _load(directory: Path, owner: Optional[int] = None) -> Dict:
+    """The session's metadata; `owner`, when given, must be the user who opened it."""
+    meta = _read_meta(directory)
+    if meta is None or _expired(meta) or (owner is not None and meta.get("owner") != owner):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found or expired")
+    return meta
+
+
+def _open_sessions(owner: int) -> int:
+    if not SESSION_ROOT.is_dir():
+        return 0
+    count = 0
+    for directory in SESSION_ROOT.iterdir():
+        meta = _read_meta(directory)
+        if meta is not None and meta.get("owner") == owner and not _expired(meta):
+            count += 1
+    return count
+
+
+def _received(directory: Path) -> List[int]:
+    return sorted(int(p.name.split(".", 1)[0]) for p in directory.glob("*.chunk"))
+
+
+def _describe(directory: Path, meta: Dict) -> Dict:
+    received = _received(directory)
+    total = _total_chunks(meta)
+    missing = sorted(set(range(total)) - set(received))
+    return {
+        "upload_id": meta["upload_id"],
+        "filename": meta["filename"],
+        "content_type": meta["content_type"],
+        "size": meta["size"],
+        "chunk_size": meta["chunk_size"],
+        "total_chunks": total,
+        "received": received,
+        "missing": missing,
+        "complete": not missing,
+        "expires_at": meta["created_at"] + settings.UPLOAD_SESSION_TTL_SECONDS,
+    }
+
+
+def _create(meta: Dict) -> Dict:
+    directory = SESSION_ROOT / meta["upload_id"]
+    with _create_lock:
+        if _open_sessions(meta["owner"]) >= settings.UPLOAD_SESSIONS_PER_CLIENT:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"At most {settings.UPLOAD_SESSIONS_PER_CLIENT} open upload sessions; finish or abort one first",
+            )
+        directory.mkdir(parents=True)
+        with open(directory / META_FILE, "w") as f:
+            json.dump(meta, f)
+    return _describe(directory, meta)
+
+
+def _status(upload_id: str, owner: Optional[int]) -> Dict:
+    directory = _session_dir(upload_id)
+    return _describe(directory, _load(directory, owner))
+
+
+def _open_chunk(upload_id: str, index: int, owner: int):
+    directory = _session_dir(upload_id)
+    meta = _load(directory, owner)
+    if not 0 <= index < _total_chunks(meta):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk index must be between 0 and {_total_chunks(meta) - 1}",
+        )
+    part_path = directory / f".{index}.{uuid4().hex}.part"
+    return meta, part_path, open(part_path, "wb")
+
+
+def _discard(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def create_session(filename: str, content_type: str, size: int, owner: int) -> Dict:
+    """Open a resumable upload of `size` bytes for user `owner` and return its status."""
+    if not content_type.startswith("image/"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{filename} is not a valid image")
+    if size > settings.UPLOAD_SESSION_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Max size: {settings.UPLOAD_SESSION_MAX_BYTES // (1024 * 1024)}MB",
+        )
+    meta = {
+        "upload_id": uuid4().hex,
+        "filename": filename,
+        "content_type": content_type,
+        "size": size,
+        "chunk_size": settings.UPLOAD_CHUNK_SIZE,
+        "created_at": time.time(),
+        "owner": owner,
+    }
+    return await anyio.to_thread.run_sync(_create, meta, limiter=_chunk_limiter)
+
+
+async def session_status(upload_id: str, owner: Optional[int] = None) -> Dict:
+    """The session's progress; with `owner`, a session opened by someone else is not found."""
+    return await anyio.to_thread.run_sync(_status, upload_id, owner, limiter=_chunk_limiter)
+
+
+async def write_chunk(upload_id: str, index: int, body: AsyncIterator[bytes], owner: int) -> Dict:
+    """Store chunk `index` (bytes at offset index * chunk_size) from a request body.
+
+    Each chunk lands in its own file via an atomic rename, so chunks can be
+    sent in parallel, in any order, and re-sent after a failure.
+    """
+    meta, part_path, buffer = await anyio.to_thread.run_sync(
+        _open_chunk, upload_id, index, owner, limiter=_chunk_limiter
+    )
+    expected = _chunk_length(meta, index)
+    written = 0
+    try:
+        try:
+            async for piece in body:
+                written += len(piece)
+                if written > expected:
+                    break
+                await anyio.to_thread.run_sync(buffer.write, piece, limiter=_chunk_limiter)
+        finally:
+            await anyio.to_thread.run_sync(buffer.close, limiter=_chunk_limiter)
+        if written != expected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk {index} must be exactly {expected} bytes",
+            )
+        await anyio.to_thread.run_sync(os.replace, part_path, part_path.parent / f"{index}.chunk", limiter=_chunk_limiter)
+    except BaseException:
+        await anyio.to_thread.run_sync(_discard, part_path, limiter=_chunk_limiter)
+        raise
+
+    return {"upload_id": upload_id, "index": index, "offset": index * meta["chunk_size"], "size": written}
+
+
+async def save_upload(
+    upload_id: str,
+    db: AsyncSession,
+    *,
+    max_size: Optional[int] = None,
+    allowed_types: Iterable[str] = IMAGE_TYPES,
+) -> str:
+    """Assemble a completed session into the media store and return its public URL.
+
+    The chunks are streamed through the same path as a direct upload, so the
+    result is validated, hashed and deduplicated exactly like save_image(),
+    up to UPLOAD_SESSION_MAX_BYTES rather than the single-request limit.
+    """
+    if max_size is None:
+        max_size = settings.UPLOAD_SESSION_MAX_BYTES
+    described = await session_status(upload_id)
+    if not described["complete"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload {upload_id} is missing chunks: {described['missing']}",
+        )
+    directory = _session_dir(upload_id)
+    chunks = [directory / f"{index}.chunk" for index in range(described["total_chunks"])]
+    url = await store_sources(
+        chunks, described["filename"], db, max_size=max_size, allowed_types=allowed_types
+    )
+    await discard_session(upload_id)
+    return url
+
+
+async def discard_session(upload_id: str) -> None:
+    directory = _session_dir(upload_id)
+    await anyio.to_thread.run_sync(
+        lambda: shutil.rmtree(directory, ignore_errors=True), limiter=_chunk_limiter
+    )
+
+
+def purge_expired_sessions() -> int:
+    """Remove sessions past UPLOAD_SESSION_TTL_SECONDS. Blocking; run from a worker thread."""
+    if not SESSION_ROOT.is_dir():
+        return 0
+    purged = 0
+    for directory in SESSION_ROOT.iterdir():
+        meta = _read_meta(directory)
+        if meta is not None and not _expired(meta):
+            continue
+        # A directory without metadata may still be mid-create; give it the TTL too
+        if meta is None and directory.stat().st_mtime + settings.UPLOAD_SESSION_TTL_SECONDS > time.time():
+            continue
+        shutil.rmtree(directory, ignore_errors=True)
+        purged += 1
+    return purged
+
+
+async def run_upload_session_purge() -> None:
+    """Background loop started from main.py; removes expired sessions about 24 times per TTL."""
+    interval = max(settings.UPLOAD_SESSION_TTL_SECONDS // 24, 60)
+    while True:
+        await anyio.sleep(interval)
+        try:
+            purged = await anyio.to_thread.run_sync(purge_expired_sessions, limiter=_chunk_limiter)
+            if purged:
+                logger.info(f"Purged {purged} expired upload sessions")
+        except Exception as e:
+            logger.error(f"Upload session purge failed: {e}")
+
+
+async def save_media(db: AsyncSession, image: Optional[UploadFile] = None, upload_id: Optional[str] = None) -> Optional[str]:
+    """Store whichever the client sent: a multipart `image` or a completed `upload_id`."""
+    if upload_id:
+        return await save_upload(upload_id, db)
+    if image:
+        return await save_image(image, db)
+    return None
+
+
+async def store_media(db: AsyncSession, image: Optional[UploadFile] = None, upload_id: Optional[str] = None) -> Optional[Dict]:
+    """Store whichever upload the client sent and render its variants.
+
+    Returns the image_url / image_variants / image_meta column values for the
+    row that will point at it, or None when neither was sent.
+    """
+    image_url = await save_media(db, image, upload_id)
+    if image_url is None:
+        return None
+    image_variants, image_meta = await process_image(image_url)
+    return {"image_url": image_url, "image_variants": image_variants, "image_meta": image_meta}
+
+
+async def replace_media(db: AsyncSession, row, image: Optional[UploadFile] = None, upload_id: Optional[str] = None) -> None:
+    """Point `row` at a newly sent image and release the one it had; a no-op when nothing was sent."""
+    fields = await store_media(db, image, upload_id)
+    if fields is None:
+        return
+    await db.run_sync(release_media, row.image_url)
+    for name, value in fields.items():
+        setattr(row, name, value)
@@ -0,0 +1,187 @@
+# app/services/uploads.py
+import os
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Sequence, Union
+from uuid import uuid4
+
+import anyio
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.media import acquire_media
+
+logger = logging.getLogger(__name__)
+
+# Project-level uploads directory, served by the /uploads mount in main.py
+UPLOAD_ROOT = Path(__file__).resolve().parents[2] / "uploads"
+# Content-addressed store shared by every media category
+MEDIA_CATEGORY = "media"
+
+CHUNK_SIZE = 64 * 1024
+MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Leading bytes of the image formats we accept, keyed by MIME type
+IMAGE_SIGNATURES = {
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/gif": (b"GIF87a", b"GIF89a"),
+    "image/webp": (b"RIFF",),
+}
+IMAGE_TYPES = tuple(IMAGE_SIGNATURES)
+IMAGE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+# Upload disk I/O runs on its own limiter so an admin upload burst can't
+# exhaust the default anyio threadpool that sync routes are scheduled on.
+_io_limiter = anyio.CapacityLimiter(8)
+
+# session.info key of the lock that serializes media references on one session
+_ACQUIRE_LOCK = "media_acquire_lock"
+
+
+def _sniff_image_type(head: bytes) -> Optional[str]:
+    for content_type, signatures in IMAGE_SIGNATURES.items():
+        if any(head.startswith(sig) for sig in signatures):
+            if content_type == "image/webp" and head[8:12] != b"WEBP":
+                continue
+            return content_type
+    return None
+
+
+def _pump_chunk(src: BinaryIO, dst: BinaryIO, digest) -> bytes:
+    chunk = src.read(CHUNK_SIZE)
+    if chunk:
+        dst.write(chunk)
+        digest.update(chunk)
+    return chunk
+
+
+def _open_part(part_path: Path) -> BinaryIO:
+    part_path.parent.mkdir(parents=True, exist_ok=True)
+    return open(part_path, "wb")
+
+
+def _open_source(source: Union[Path, BinaryIO]) -> BinaryIO:
+    if isinstance(source, Path):
+        return open(source, "rb")
+    source.seek(0)
+    return source
+
+
+def _commit_part(part_path: Path, final_path: Path) -> None:
+    if final_path.exists():
+        # Identical bytes are already stored; refresh the mtime so the GC grace period restarts
+        part_path.unlink()
+        os.utime(final_path)
+    else:
+        os.replace(part_path, final_path)
+
+
+def _acquire_lock(db: AsyncSession) -> asyncio.Lock:
+    # An AsyncSession runs one statement at a time; concurrent stores on it
+    # (gallery batches) stream their files in parallel and take turns here
+    return db.sync_session.info.setdefault(_ACQUIRE_LOCK, asyncio.Lock())
+
+
+def _discard(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def store_sources(
+    sources: Sequence[Union[Path, BinaryIO]],
+    label: str,
+    db: AsyncSession,
+    *,
+    max_size: int = MAX_IMAGE_SIZE,
+    allowed_types: Iterable[str] = IMAGE_TYPES,
+) -> str:
+    """Stream `sources` (file objects or paths, concatenated in order) into the media store.
+
+    The bytes are copied in CHUNK_SIZE pieces on a dedicated worker limiter; the
+    size limit, the file signature and the SHA-256 are computed while copying.
+    The file is named after its hash, so identical bytes are stored once, and
+    a reference is recorded on `db` for the caller's transaction to commit.
+    """
+    allowed_types = tuple(allowed_types)
+    directory = UPLOAD_ROOT / MEDIA_CATEGORY
+    part_path = directory / f".{uuid4().hex}.part"
+    digest = hashlib.sha256()
+    content_type = None
+
+    buffer = await anyio.to_thread.run_sync(_open_part, part_path, limiter=_io_limiter)
+    size = 0
+    try:
+        try:
+            for source in sources:
+                src = await anyio.to_thread.run_sync(_open_source, source, limiter=_io_limiter)
+                try:
+                    while True:
+                        chunk = await anyio.to_thread.run_sync(_pump_chunk, src, buffer, digest, limiter=_io_limiter)
+                        if not chunk:
+                            break
+                        if size == 0:
+                            content_type = _sniff_image_type(chunk)
+                            if content_type not in allowed_types:
+                                raise HTTPException(
+                                    status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail=f"{label} is not a valid image. Allowed types: {', '.join(allowed_types)}",
+                                )
+                        size += len(chunk)
+                        if size > max_size:
+                            raise HTTPException(
+                                status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"File too large. Max size: {max_size // (1024 * 1024)}MB",
+                            )
+                finally:
+                    if src is not source:
+                        await anyio.to_thread.run_sync(src.close, limiter=_io_limiter)
+        finally:
+            await anyio.to_thread.run_sync(buffer.close, limiter=_io_limiter)
+
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{label} is empty")
+
+        sha256 = digest.hexdigest()
+        filename = f"{sha256}{IMAGE_EXTENSIONS[content_type]}"
+        await anyio.to_thread.run_sync(_commit_part, part_path, directory / filename, limiter=_io_limiter)
+    except HTTPException:
+        await anyio.to_thread.run_sync(_discard, part_path, limiter=_io_limiter)
+        raise
+    except Exception as e:
+        await anyio.to_thread.run_sync(_discard, part_path, limiter=_io_limiter)
+        logger.error(f"Error saving upload: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save image",
+        )
+
+    url = f"/uploads/{MEDIA_CATEGORY}/{filename}"
+    async with _acquire_lock(db):
+        await db.run_sync(acquire_media, sha256, url, size, content_type)
+    return url
+
+
+async def save_image(
+    image: UploadFile,
+    db: AsyncSession,
+    *,
+    max_size: int = MAX_IMAGE_SIZE,
+    allowed_types: Iterable[str] = IMAGE_TYPES,
+) -> str:
+    """Stream an uploaded image into the media store and return its public URL."""
+    if not (image.content_type or "").startswith("image/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{image.filename} is not a valid image",
+        )
+    return await store_sources([image.file], image.filename, db, max_size=max_size, allowed_types=allowed_types)
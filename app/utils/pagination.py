@@ -0,0 +1,92 @@
+# app/utils/pagination.py
+import json
+import base64
+from datetime import date, datetime, time
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Clients pass this back as ?cursor= to fetch the following page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """`?limit=&cursor=` query parameters shared by every keyset-paginated list."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def _encode_value(value: Any):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match this list")
+        decoded = []
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+            if python_type in (datetime, date, time):
+                value = python_type.fromisoformat(value)
+            elif not isinstance(value, python_type):
+                value = python_type(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset(stmt, columns: Sequence, page: PageParams, descending: bool = True):
+    """Order `stmt` (a Query or select()) by `columns` and start after `page.cursor`.
+
+    `columns` must end with a unique, non-null key (normally the primary key) so
+    the ordering is total. The comparison is a single row-value predicate, which
+    the matching composite index answers with a range scan at any depth.
+    One extra row is fetched to tell whether another page follows.
+    """
+    if page.cursor:
+        values = decode_cursor(page.cursor, columns)
+        key = tuple_(*columns)
+        stmt = stmt.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+    ordering = [c.desc() if descending else c.asc() for c in columns]
+    return stmt.order_by(*ordering).limit(page.limit + 1)
+
+
+def finish_page(rows: Sequence, columns: Sequence, page: PageParams, response: Response) -> List:
+    """Trim the look-ahead row and set the next cursor header when more rows exist."""
+    rows = list(rows)
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows
+
+
+def paginate(query, columns: Sequence, page: PageParams, response: Response, descending: bool = True) -> List:
+    """Run one keyset page of a sync ORM Query."""
+    return finish_page(keyset(query, columns, page, descending).all(), columns, page, response)
+
+
+async def paginate_async(db, stmt, columns: Sequence, page: PageParams, response: Response, descending: bool = True) -> List:
+    """Run one keyset page of a select() on an AsyncSession."""
+    rows = (await db.scalars(keyset(stmt, columns, page, descending))).all()
+    return finish_page(rows, columns, page, response)
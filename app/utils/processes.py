@@ -0,0 +1,16 @@
+# app/utils/processes.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def new_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """A process pool that is safe to create from a running, multithreaded server.
+
+    Forking a process with other threads running can deadlock the child, so
+    workers start from a forkserver where the platform has one and with the
+    platform default (spawn) elsewhere.
+    """
+    context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
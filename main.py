@@ -2,10 +2,21 @@
 
 from fastapi import FastAPI
 import uvicorn
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.services.static_media import MediaStaticFiles
+from app.middleware.db_routing import ReadReplicaMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware, run_idempotency_purge
+from app.middleware.response_cache import ResponseCacheMiddleware
+from app.middleware.conditional_get import ConditionalGetMiddleware
+from app.crud.table_version import track_table_versions
+from app.services.response_cache import response_cache
+from app.services.identity_cache import track_user_changes
+from app.db.changes import on_commit
+from app.utils.pagination import NEXT_CURSOR_HEADER
 import os
+import asyncio
 from pathlib import Path
 
 app = FastAPI()
@@ -18,12 +29,55 @@ origins = [
     "https://www.ptownentertainment.com/"
 ]
 
+# Public catalog routes and the tables their responses are built from
+CATALOG_ROUTES = {
+    "/services": ("services", "sub_services"),
+    "/banners": ("banners",),
+    "/pastevents": ("pastevents",),
+    "/teams": ("teams",),
+    "/testimonials": ("testimonial",),
+    "/gallery/getallgallerry": ("gallery",),
+    "/news/getAllNews": ("news",),
+}
+
+# ETag / Last-Modified from per-table version counters, bumped with every write
+track_table_versions({table for tables in CATALOG_ROUTES.values() for table in tables})
+app.add_middleware(ConditionalGetMiddleware, routes=CATALOG_ROUTES)
+
+# Whole responses, keyed by path + query and dropped when their tables are written
+app.add_middleware(ResponseCacheMiddleware, routes=CATALOG_ROUTES, cache=response_cache)
+on_commit(response_cache.tables_written)
+
+# Token checks resolve users from a per-worker cache; commits changing a user's sign-in details evict them
+track_user_changes()
+
+# Retried submissions with the same Idempotency-Key get the first response back
+app.add_middleware(
+    IdempotencyMiddleware,
+    paths=("/bookings/", "/contact", "/getintouch/", "/loyalty-points/adjust/"),
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    lease_seconds=settings.IDEMPOTENCY_LEASE_SECONDS,
+)
+
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        repeat_threshold=settings.SQL_REPEAT_THRESHOLD,
+        raise_on_repeat=settings.SQL_REPEAT_RAISE and settings.ENVIRONMENT != "production",
+    )
+
+app.add_middleware(
+    ReadReplicaMiddleware,
+    window_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Now include your routers below this
@@ -87,13 +141,73 @@ app.include_router(Testimonial.router)
 from app.api.routes import getintouch
 app.include_router(getintouch.router)
 
+from app.api.routes import media
+app.include_router(media.router)
+
+from app.api.routes import upload_sessions
+app.include_router(upload_sessions.router)
+
+from app.api.routes import metrics
+app.include_router(metrics.router)
+
+from app.services.media_gc import run_media_gc
+from app.services.upload_sessions import run_upload_session_purge
+from app.services.images import shutdown_image_pool
+from app.services.passwords import shutdown_password_pool
+from app.db.session import DATABASE_URL, async_engine
+from app.db.profile import is_sqlite
+
+@app.on_event("startup")
+def create_sqlite_schema():
+    # Local/benchmark SQLite databases are built from the models; Postgres uses alembic
+    if is_sqlite(DATABASE_URL):
+        from app.db.init_db import create_schema
+        create_schema()
+
+@app.on_event("startup")
+async def start_media_gc():
+    if settings.MEDIA_GC_INTERVAL_SECONDS > 0:
+        app.state.media_gc_task = asyncio.create_task(run_media_gc())
+
+@app.on_event("startup")
+async def start_idempotency_purge():
+    if settings.IDEMPOTENCY_TTL_SECONDS > 0:
+        app.state.idempotency_purge_task = asyncio.create_task(
+            run_idempotency_purge(settings.IDEMPOTENCY_TTL_SECONDS)
+        )
+
+@app.on_event("startup")
+async def start_upload_session_purge():
+    if settings.UPLOAD_SESSION_TTL_SECONDS > 0:
+        app.state.upload_session_purge_task = asyncio.create_task(run_upload_session_purge())
+
+@app.on_event("startup")
+async def start_response_cache():
+    await response_cache.start()
+
+@app.on_event("shutdown")
+async def stop_response_cache():
+    await response_cache.stop()
+
+@app.on_event("shutdown")
+def stop_image_pool():
+    shutdown_image_pool()
+
+@app.on_event("shutdown")
+def stop_password_pool():
+    shutdown_password_pool()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+
 # Serve uploaded images
 # uploads_dir = Path(__file__).resolve().parent / "uploads"
 # app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 #media
 # app.mount("/media", StaticFiles(directory="media"), name="media")
 uploads_dir = Path(__file__).resolve().parent / "uploads"
-app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
+app.mount("/uploads", MediaStaticFiles(directory=uploads_dir), name="uploads")
 
 if __name__ == "__main__":
     environment = settings.ENVIRONMENT
@@ -102,7 +216,7 @@ if __name__ == "__main__":
 
     host="0.0.0.0"
 
-    workers = 4 if environment =="production" else 1
+    workers = settings.worker_count
 
 
     if environment == "production" :
@@ -0,0 +1,7 @@
+# tests/conftest.py
+import os
+
+# The app builds its engines at import; run the suite on a private in-memory
+# SQLite database (app/db/profile.py) rather than whatever .env points at
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["ENVIRONMENT"] = "test"
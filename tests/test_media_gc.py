@@ -0,0 +1,136 @@
+# tests/test_media_gc.py
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.init_db import create_schema
+from app.db.model.media import MediaBlob
+from app.db.model.user import User
+from app.db.session import SessionLocal, engine
+from app.services import media_gc
+
+pytestmark = pytest.mark.anyio
+
+GRACE = 3600
+LONG_AGO = time.time() - 2 * GRACE
+
+REFERENCED = "a" * 64
+RELEASED = "b" * 64
+RECENTLY_RELEASED = "c" * 64
+NEVER_COMMITTED = "d" * 64
+IN_FLIGHT = "e" * 64
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db():
+    create_schema(engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+    for table in (MediaBlob.__table__, User.__table__):
+        with engine.begin() as conn:
+            conn.execute(table.delete())
+
+
+def write(root, name, old=True):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * 10)
+    if old:
+        os.utime(path, (LONG_AGO, LONG_AGO))
+    return path
+
+
+def blob(sha256, ref_count, released_ago):
+    return MediaBlob(
+        sha256=sha256,
+        url=f"/uploads/media/{sha256}.jpg",
+        size=10,
+        ref_count=ref_count,
+        updated_at=datetime.utcnow() - timedelta(seconds=released_ago),
+    )
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch, db):
+    monkeypatch.setattr(media_gc, "UPLOAD_ROOT", tmp_path)
+    db.add_all([
+        blob(REFERENCED, 1, 2 * GRACE),
+        blob(RELEASED, 0, 2 * GRACE),
+        blob(RECENTLY_RELEASED, 0, 60),
+        User(email="a@example.com", hashed_password="x", profile_image="/uploads/profile_images/kept.jpg"),
+    ])
+    db.commit()
+    for name in (
+        f"media/{REFERENCED}.jpg",
+        f"media/{REFERENCED}_320w.webp",
+        f"media/{RELEASED}.jpg",
+        f"media/{RELEASED}_320w.webp",
+        f"media/{RECENTLY_RELEASED}.jpg",
+        f"media/{NEVER_COMMITTED}.jpg",
+        "profile_images/kept.jpg",
+        "profile_images/stray.jpg",
+        ".sessions/0123/0.chunk",
+        ".gc.lock",
+    ):
+        write(tmp_path, name)
+    # Just stored, its row not committed yet
+    write(tmp_path, f"media/{IN_FLIGHT}.jpg", old=False)
+    return tmp_path
+
+
+ORPHANS = {
+    f"/uploads/media/{RELEASED}.jpg",
+    f"/uploads/media/{RELEASED}_320w.webp",
+    f"/uploads/media/{NEVER_COMMITTED}.jpg",
+    "/uploads/profile_images/stray.jpg",
+}
+
+
+def remaining(root):
+    return {f"/uploads/{p.relative_to(root).as_posix()}" for p in root.rglob("*") if p.is_file()}
+
+
+async def test_dry_run_lists_orphans_and_deletes_nothing(uploads):
+    before = remaining(uploads)
+
+    report = await media_gc.sweep_orphans(dry_run=True, grace_seconds=GRACE)
+
+    assert set(report["files"]) == ORPHANS
+    assert report["deleted"] == 0
+    assert remaining(uploads) == before
+
+
+async def test_sweep_removes_exactly_the_orphans(uploads, db):
+    before = remaining(uploads)
+
+    report = await media_gc.sweep_orphans(dry_run=False, grace_seconds=GRACE, batch_size=2, pause_seconds=0)
+
+    assert report["deleted"] == len(ORPHANS)
+    assert remaining(uploads) == before - ORPHANS
+    # Only the released blob's row goes; a recently released one may still be reacquired
+    assert {row.sha256 for row in db.query(MediaBlob)} == {REFERENCED, RECENTLY_RELEASED}
+
+
+async def test_sweep_skips_a_blob_reacquired_after_the_scan(uploads, db, monkeypatch):
+    scan = media_gc._scan
+
+    def scan_then_reacquire(grace_seconds):
+        orphans = scan(grace_seconds)
+        db.query(MediaBlob).filter_by(sha256=RELEASED).update({"ref_count": 1})
+        db.commit()
+        return orphans
+
+    monkeypatch.setattr(media_gc, "_scan", scan_then_reacquire)
+
+    await media_gc.sweep_orphans(dry_run=False, grace_seconds=GRACE, pause_seconds=0)
+
+    assert f"/uploads/media/{RELEASED}.jpg" in remaining(uploads)
+    assert db.get(MediaBlob, RELEASED) is not None
@@ -0,0 +1,85 @@
+# tests/test_redis_cache.py
+import anyio
+import fakeredis
+import pytest
+
+from app.services.redis_cache import RedisCacheBackend
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def backend(server) -> RedisCacheBackend:
+    return RedisCacheBackend(fakeredis.aioredis.FakeRedis(server=server), prefix="test")
+
+
+async def wait_for_subscriber(cache: RedisCacheBackend) -> None:
+    # Messages published before the subscriber attaches are lost
+    while True:
+        [(_, count)] = await cache.client.pubsub_numsub(cache.channel)
+        if count:
+            return
+        await anyio.sleep(0.01)
+
+
+async def test_bump_advances_only_the_written_tags(server):
+    cache = backend(server)
+    assert await cache.versions(["news", "gallery"]) == (0, 0)
+
+    await cache.bump({"news"}, origin="worker-1")
+    await cache.bump({"news", "gallery"}, origin="worker-1")
+
+    assert await cache.versions(["news", "gallery"]) == (2, 1)
+
+
+async def test_bump_makes_entries_of_older_versions_unreachable(server):
+    cache = backend(server)
+    versions = await cache.versions(["news"])
+    await cache.put("/news/getAllNews?", versions, b"body", ttl_seconds=60)
+
+    await cache.bump({"news"}, origin="worker-1")
+
+    assert await cache.get("/news/getAllNews?", await cache.versions(["news"])) is None
+    assert await cache.get("/news/getAllNews?", versions) == b"body"
+
+
+async def test_put_get_round_trip_with_ttl(server):
+    cache = backend(server)
+    await cache.put("/banners/?page=1", (3, 1), b"payload", ttl_seconds=30)
+
+    assert await cache.get("/banners/?page=1", (3, 1)) == b"payload"
+    assert await cache.get("/banners/?page=1", (3, 2)) is None
+    assert await cache.get("/banners/?page=2", (3, 1)) is None
+    ttl = await cache.client.ttl(cache._entry_key("/banners/?page=1", (3, 1)))
+    assert 0 < ttl <= 30
+
+
+async def test_invalidation_reaches_another_backend(server):
+    publisher, subscriber = backend(server), backend(server)
+    received = []
+    reconnects = []
+    delivered = anyio.Event()
+
+    def on_invalidate(origin, tags):
+        received.append((origin, tags))
+        delivered.set()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(subscriber.listen, on_invalidate, lambda: reconnects.append(True))
+        with anyio.fail_after(5):
+            await wait_for_subscriber(publisher)
+            await publisher.bump({"teams", "banners"}, origin="worker-1")
+            await delivered.wait()
+        tg.cancel_scope.cancel()
+
+    assert received == [("worker-1", ["banners", "teams"])]
+    assert reconnects == [True]